@@ -1,6 +1,5 @@
 import streamlit as st
 import os
-import tempfile
 from dotenv import load_dotenv
 
 # Apply performance optimizations
@@ -26,6 +25,8 @@ def get_constants():
         'ERROR_RESUME_MISSING': constants_module.ERROR_RESUME_MISSING,
         'ERROR_GENERATING_COVER_LETTER': constants_module.ERROR_GENERATING_COVER_LETTER,
         'ERROR_EXTRACTING_JOB_INFO': constants_module.ERROR_EXTRACTING_JOB_INFO,
+        'ERROR_CREATING_PDF': constants_module.ERROR_CREATING_PDF,
+        'ERROR_MEMORY_PRESSURE': constants_module.ERROR_MEMORY_PRESSURE,
         'SUPPORTED_FILE_TYPES': constants_module.SUPPORTED_FILE_TYPES,
         'PDF_MIME_TYPE': constants_module.PDF_MIME_TYPE,
         'TEXT_MIME_TYPE': constants_module.TEXT_MIME_TYPE,
@@ -34,24 +35,43 @@ def get_constants():
         'DEFAULT_TEMPERATURE': constants_module.DEFAULT_TEMPERATURE,
         'LABEL_GENERATE_COVER_LETTER': constants_module.LABEL_GENERATE_COVER_LETTER,
         'LABEL_DOWNLOAD_PDF': constants_module.LABEL_DOWNLOAD_PDF,
+        'LABEL_PREPARE_PDF': constants_module.LABEL_PREPARE_PDF,
         'LABEL_JOB_URL': constants_module.LABEL_JOB_URL,
         'LABEL_JOB_DESCRIPTION': constants_module.LABEL_JOB_DESCRIPTION,
         'LABEL_RESUME_CONTENT': constants_module.LABEL_RESUME_CONTENT,
         'LABEL_RESUME_UPLOAD': constants_module.LABEL_RESUME_UPLOAD,
         'LABEL_ADDITIONAL_CONTEXT': constants_module.LABEL_ADDITIONAL_CONTEXT,
         'LABEL_COVER_LETTER': constants_module.LABEL_COVER_LETTER,
+        'LABEL_FRESH_VARIANT': constants_module.LABEL_FRESH_VARIANT,
         'HELP_JOB_URL': constants_module.HELP_JOB_URL,
         'HELP_JOB_DESCRIPTION': constants_module.HELP_JOB_DESCRIPTION,
         'HELP_RESUME_CONTENT': constants_module.HELP_RESUME_CONTENT,
         'HELP_RESUME_UPLOAD': constants_module.HELP_RESUME_UPLOAD,
         'HELP_ADDITIONAL_CONTEXT': constants_module.HELP_ADDITIONAL_CONTEXT,
         'HELP_CONTEXT_FILES': constants_module.HELP_CONTEXT_FILES,
+        'HELP_FRESH_VARIANT': constants_module.HELP_FRESH_VARIANT,
     }
 
 def get_utils():
     from src.utils import validate_inputs, display_error, display_success, display_warning
     return validate_inputs, display_error, display_success, display_warning
 
+def get_upload_digest(uploaded_file) -> str:
+    from src.upload_cache import upload_digest
+    return upload_digest(uploaded_file, st.session_state)
+
+def get_metrics():
+    import src.metrics as metrics
+    return metrics
+
+def get_memory_governor():
+    from src.memory_governor import get_memory_governor
+    return get_memory_governor()
+
+def is_memory_pressure(error: Exception) -> bool:
+    from src.memory_governor import MemoryPressureError
+    return isinstance(error, MemoryPressureError)
+
 def get_progress_indicator():
     from src.progress_indicator import ProgressIndicator
     return ProgressIndicator
@@ -69,6 +89,89 @@ def get_cached_constants():
     """Cache constants to avoid reloading"""
     return get_constants()
 
+def render_stream(chunks, label: str, pending_message: str) -> str:
+    """Show streamed text as it arrives, then settle it into a text area; returns the full text"""
+    placeholder = st.empty()
+    placeholder.info(f"⏳ {pending_message}")
+    
+    text = ""
+    for chunk in chunks:
+        text += chunk
+        placeholder.text(text)
+    
+    if text:
+        placeholder.text_area(label, value=text, height=400)
+    else:
+        placeholder.empty()
+    return text
+
+def render_pdf_download(text: str, file_name: str, key: str):
+    """Render the PDF only once it is asked for; the generator serves repeat requests from its PDF cache"""
+    constants = get_cached_constants()
+    ready_key = f"{key}_pdf_text"
+    
+    if st.session_state.get(ready_key) != text:
+        if not st.button(constants['LABEL_PREPARE_PDF'], key=f"{key}_prepare_pdf", use_container_width=True):
+            return
+    
+    try:
+        pdf_data = st.session_state.generator.create_pdf(text)
+    except Exception as e:
+        # Back to the prepare button, so a failed render isn't retried on every rerun
+        st.session_state.pop(ready_key, None)
+        validate_inputs, display_error, display_success, display_warning = get_utils()
+        if is_memory_pressure(e):
+            display_error(constants['ERROR_MEMORY_PRESSURE'])
+        else:
+            display_error(constants['ERROR_CREATING_PDF'].format(error=str(e)))
+        return
+    st.session_state[ready_key] = text
+    
+    st.download_button(
+        label=constants['LABEL_DOWNLOAD_PDF'],
+        data=pdf_data,
+        file_name=file_name,
+        mime=constants['PDF_MIME_TYPE'],
+        use_container_width=True
+    )
+
+def render_debug_panel():
+    """Per-stage breakdown of the session's last request and process-wide stage totals"""
+    metrics = get_metrics()
+    if not metrics.ENABLED:
+        return
+    
+    with st.sidebar.expander("🔍 Performance debug"):
+        last_trace = st.session_state.get("last_trace")
+        if last_trace is None:
+            st.caption("Generate or improve a cover letter to see its stage timings.")
+        else:
+            summary = f"**{last_trace.name}** took {last_trace.seconds:.2f}s"
+            if last_trace.rss_mb is not None:
+                summary += f", RSS {last_trace.rss_mb:.0f} MB"
+            st.markdown(summary)
+            st.dataframe(last_trace.stages, use_container_width=True, hide_index=True)
+        
+        governor = get_memory_governor()
+        if governor is not None:
+            usage = governor.usage()
+            st.caption(
+                f"Memory: RSS {usage['rss_mb']} MB (soft {usage['soft_limit_mb']:.0f}, hard {usage['hard_limit_mb']:.0f}); "
+                f"vectorstores {usage['vectorstores_mb']} MB, uploads {usage['upload_cache_mb']} MB, PDFs {usage['pdf_cache_mb']} MB"
+            )
+        
+        stages = metrics.registry.snapshot()["histograms"].get("stage_seconds", [])
+        if stages:
+            st.caption("All requests in this process")
+            st.dataframe(
+                [
+                    {"stage": s["stage"], "count": s["count"], "mean_seconds": round(s["sum"] / s["count"], 4)}
+                    for s in stages
+                ],
+                use_container_width=True,
+                hide_index=True
+            )
+
 def main():
     st.sidebar.title("Leks CV Generator")
     
@@ -81,6 +184,9 @@ def main():
         generate_page()
     elif page == "Improve Cover Letter":
         improve_page()
+    
+    # Drawn after the page so it already shows the request that just ran
+    render_debug_panel()
 
 def generate_page():
     st.title("📝 Generate New Cover Letter")
@@ -159,30 +265,15 @@ def generate_page():
     
     resume_text = ""
     if resume_file:
-        # Cache processed resume content to avoid reprocessing
-        file_hash = hash(resume_file.getvalue())
-        cache_key = f"resume_{file_hash}"
+        # Hashed once per upload; parsed PDFs live in the shared, memory-bounded upload cache
+        file_digest = get_upload_digest(resume_file)
         
-        if cache_key not in st.session_state:
-            with st.spinner("Processing resume file..."):
-                if resume_file.type == "application/pdf":
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-                        tmp_file.write(resume_file.getvalue())
-                        tmp_file_path = tmp_file.name
-                    
-                    try:
-                        from langchain.document_loaders import PyPDFLoader
-                        loader = PyPDFLoader(tmp_file_path)
-                        docs = loader.load()
-                        resume_text = "\n".join([doc.page_content for doc in docs])
-                    finally:
-                        os.unlink(tmp_file_path)
-                elif resume_file.type == "text/plain":
-                    resume_text = resume_file.getvalue().decode("utf-8")
-                
-                st.session_state[cache_key] = resume_text
-        else:
-            resume_text = st.session_state[cache_key]
+        with st.spinner("Processing resume file..."):
+            if resume_file.type == "application/pdf":
+                from src.pdf_ingestion import extract_pdf_text
+                resume_text = extract_pdf_text(resume_file.getvalue(), file_digest)
+            elif resume_file.type == "text/plain":
+                resume_text = resume_file.getvalue().decode("utf-8")
         
         # Resume content is loaded but not displayed to keep UI clean
     
@@ -196,17 +287,23 @@ def generate_page():
     )
     
     if context_files:
-        # Cache context files processing
-        files_hash = hash(tuple(f.getvalue() for f in context_files))
-        context_cache_key = f"context_{files_hash}"
+        # Only reload when the set of uploaded files changes; one entry per session, not per file set
+        file_digests = tuple(get_upload_digest(f) for f in context_files)
         
-        if context_cache_key not in st.session_state:
+        # Also reload when the memory governor dropped this session's context layer or a file failed to embed
+        if st.session_state.get("context_digests") != file_digests or not st.session_state.generator.has_context_files(file_digests):
             with st.spinner("Processing uploaded files..."):
-                num_docs = st.session_state.generator.load_context_files(context_files)
-                st.session_state[context_cache_key] = num_docs
-                display_success(constants['SUCCESS_CONTEXT_PROCESSED'].format(num_docs=num_docs))
-        else:
-            num_docs = st.session_state[context_cache_key]
+                try:
+                    st.session_state.context_num_docs = st.session_state.generator.load_context_files(context_files, file_digests)
+                    st.session_state.context_digests = file_digests
+                except Exception as e:
+                    if not is_memory_pressure(e):
+                        raise
+                    # context_digests is left as it was, so the files are loaded on a later rerun
+                    display_error(constants['ERROR_MEMORY_PRESSURE'])
+        
+        if st.session_state.get("context_digests") == file_digests:
+            num_docs = st.session_state.context_num_docs
             display_success(constants['SUCCESS_CONTEXT_PROCESSED'].format(num_docs=num_docs))
     
     additional_context = st.text_area(
@@ -220,42 +317,52 @@ def generate_page():
     with col_left:
         st.header("🔧 Generate Cover Letter")
         
+        fresh_variant = st.checkbox(
+            constants['LABEL_FRESH_VARIANT'],
+            help=constants['HELP_FRESH_VARIANT']
+        )
+        
         if st.button(constants['LABEL_GENERATE_COVER_LETTER'], type="primary", use_container_width=True):
             is_valid, error_message = validate_inputs(resume_text, job_description, api_key)
             
             if not is_valid:
                 display_error(error_message)
             else:
-                with st.spinner("Generating your cover letter..."):
-                    try:
-                        cover_letter = st.session_state.generator.generate_cover_letter(
-                            resume_text, 
-                            job_description, 
-                            job_url, 
-                            additional_context,
-                            job_title,
-                            company_name
+                try:
+                    status_placeholder = st.empty()
+                    st.header("📝 Generated Cover Letter")
+                    
+                    with get_metrics().trace("generate") as request_trace:
+                        cover_letter = render_stream(
+                            st.session_state.generator.stream_cover_letter(
+                                resume_text, 
+                                job_description, 
+                                job_url, 
+                                additional_context,
+                                job_title,
+                                company_name,
+                                fresh=fresh_variant
+                            ),
+                            constants['LABEL_COVER_LETTER'],
+                            "Generating your cover letter..."
                         )
-                        
-                        if cover_letter:
+                    st.session_state.last_trace = request_trace
+                    
+                    if cover_letter:
+                        st.session_state.generated_cover_letter = cover_letter
+                        with status_placeholder:
                             display_success(constants['SUCCESS_COVER_LETTER_GENERATED'])
-                            
-                            st.header("📝 Generated Cover Letter")
-                            st.text_area(constants['LABEL_COVER_LETTER'], value=cover_letter, height=400)
-                            
-                            pdf_data = st.session_state.generator.create_pdf(cover_letter)
-                            
-                            st.download_button(
-                                label=constants['LABEL_DOWNLOAD_PDF'],
-                                data=pdf_data,
-                                file_name=constants['DEFAULT_PDF_FILENAME'],
-                                mime=constants['PDF_MIME_TYPE'],
-                                use_container_width=True
-                            )
-                        else:
-                            display_error("Failed to generate cover letter. Please check your inputs and try again.")
-                    except Exception as e:
-                        display_error(constants['ERROR_GENERATING_COVER_LETTER'].format(error=str(e)))
+                    else:
+                        display_error("Failed to generate cover letter. Please check your inputs and try again.")
+                except Exception as e:
+                    display_error(constants['ERROR_GENERATING_COVER_LETTER'].format(error=str(e)))
+        elif st.session_state.get('generated_cover_letter'):
+            # Keep the last letter on reruns, e.g. after preparing its PDF
+            st.header("📝 Generated Cover Letter")
+            st.text_area(constants['LABEL_COVER_LETTER'], value=st.session_state.generated_cover_letter, height=400)
+        
+        if st.session_state.get('generated_cover_letter'):
+            render_pdf_download(st.session_state.generated_cover_letter, constants['DEFAULT_PDF_FILENAME'], "generated")
 
 def improve_page():
     st.title("✨ Improve Existing Cover Letter")
@@ -293,17 +400,8 @@ def improve_page():
         with st.spinner("Processing cover letter..."):
             try:
                 if cover_letter_file.type == "application/pdf":
-                    import tempfile
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-                        tmp_file.write(cover_letter_file.getvalue())
-                        tmp_file_path = tmp_file.name
-                    
-                    try:
-                        from pypdf import PdfReader
-                        reader = PdfReader(tmp_file_path)
-                        existing_cover_letter = "\n".join([page.extract_text() for page in reader.pages])
-                    finally:
-                        os.unlink(tmp_file_path)
+                    from src.pdf_ingestion import extract_pdf_text
+                    existing_cover_letter = extract_pdf_text(cover_letter_file.getvalue(), get_upload_digest(cover_letter_file))
                 elif cover_letter_file.type == "text/plain":
                     existing_cover_letter = cover_letter_file.getvalue().decode("utf-8")
                 elif cover_letter_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
@@ -313,7 +411,7 @@ def improve_page():
                 if existing_cover_letter:
                     st.success("✅ Cover letter loaded successfully!")
                     st.text_area("Loaded Cover Letter", value=existing_cover_letter, height=200, disabled=True)
-                
+            
             except Exception as e:
                 st.error(f"Error processing file: {str(e)}")
     
@@ -337,41 +435,50 @@ def improve_page():
         help="Describe what specific improvements you'd like to make to your cover letter"
     )
     
+    constants = get_cached_constants()
+    fresh_variant = st.checkbox(
+        constants['LABEL_FRESH_VARIANT'],
+        help=constants['HELP_FRESH_VARIANT']
+    )
+    
     if st.button("✨ Improve Cover Letter", type="primary", use_container_width=True):
         if existing_cover_letter.strip():
-            with st.spinner("Improving your cover letter..."):
-                try:
-                    improved_letter = st.session_state.generator.improve_cover_letter_with_prompt(
-                        existing_cover_letter, 
-                        improvement_prompt
+            try:
+                status_placeholder = st.empty()
+                st.header("📝 Improved Cover Letter")
+                
+                with get_metrics().trace("improve") as request_trace:
+                    improved_letter = render_stream(
+                        st.session_state.generator.stream_improved_cover_letter_with_prompt(
+                            existing_cover_letter, 
+                            improvement_prompt,
+                            fresh=fresh_variant
+                        ),
+                        "Improved Cover Letter",
+                        "Improving your cover letter..."
                     )
-                    
-                    if improved_letter:
-                        validate_inputs, display_error, display_success, display_warning = get_utils()
+                st.session_state.last_trace = request_trace
+                
+                if improved_letter:
+                    st.session_state.improved_cover_letter = improved_letter
+                    validate_inputs, display_error, display_success, display_warning = get_utils()
+                    with status_placeholder:
                         display_success("✅ Cover letter improved successfully!")
-                        
-                        st.header("📝 Improved Cover Letter")
-                        st.text_area("Improved Cover Letter", value=improved_letter, height=400)
-                        
-                        pdf_data = st.session_state.generator.create_pdf(improved_letter)
-                        
-                        constants = get_constants()
-                        st.download_button(
-                            label=constants['LABEL_DOWNLOAD_PDF'],
-                            data=pdf_data,
-                            file_name="improved_cover_letter.pdf",
-                            mime=constants['PDF_MIME_TYPE'],
-                            use_container_width=True
-                        )
-                    else:
-                        validate_inputs, display_error, display_success, display_warning = get_utils()
-                        display_error("Failed to improve cover letter. Please try again.")
-                except Exception as e:
+                else:
                     validate_inputs, display_error, display_success, display_warning = get_utils()
-                    display_error(f"Error improving cover letter: {str(e)}")
+                    display_error("Failed to improve cover letter. Please try again.")
+            except Exception as e:
+                validate_inputs, display_error, display_success, display_warning = get_utils()
+                display_error(f"Error improving cover letter: {str(e)}")
         else:
             validate_inputs, display_error, display_success, display_warning = get_utils()
             display_error("Please upload a cover letter file or paste your cover letter text.")
+    elif st.session_state.get('improved_cover_letter'):
+        st.header("📝 Improved Cover Letter")
+        st.text_area("Improved Cover Letter", value=st.session_state.improved_cover_letter, height=400)
+    
+    if st.session_state.get('improved_cover_letter'):
+        render_pdf_download(st.session_state.improved_cover_letter, "improved_cover_letter.pdf", "improved")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,67 @@
+"""
+Crawl the saved pages in benchmarks/fixtures/ from a local HTTP server, one URL at a time
+and then concurrently, with an artificial per-response delay standing in for network latency
+
+    python -m benchmarks.bench_crawler --urls 48 --delay 0.2 --output crawl.jsonl
+"""
+import argparse
+import functools
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from src.job_crawler import JobCrawler
+from src.performance_config import PerformanceConfig
+from src.rate_limiter import HostRateLimiter
+
+from .bench_html_extraction import FIXTURES_DIR, load_fixtures
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    delay = 0.0
+    
+    def do_GET(self):
+        time.sleep(self.delay)
+        super().do_GET()
+    
+    def log_message(self, format, *args):
+        pass
+
+def serve_fixtures(delay: float) -> ThreadingHTTPServer:
+    """Serve the fixtures directory on a free localhost port from a background thread"""
+    handler = functools.partial(type("Handler", (FixtureHandler,), {"delay": delay}), directory=FIXTURES_DIR)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def fixture_urls(port: int, count: int, run: str):
+    """count URLs cycling through the fixtures, unique per run so no cache is shared between runs"""
+    names = [name for name, _, _ in load_fixtures()]
+    return [f"http://127.0.0.1:{port}/{names[i % len(names)]}?run={run}&n={i}" for i in range(count)]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the job crawler against a local fixture server")
+    parser.add_argument("--urls", type=int, default=48, help="URLs per run")
+    parser.add_argument("--delay", type=float, default=0.2, help="Seconds the server waits before each response")
+    parser.add_argument("--concurrency", type=int, default=16, help="URLs in flight in the concurrent run")
+    parser.add_argument("--output", help="JSONL file for the concurrent run's records")
+    args = parser.parse_args(argv)
+    
+    # Measure fetching and extraction, not the conditional-GET cache or politeness limits
+    PerformanceConfig.ENABLE_REQUEST_CACHING = False
+    unlimited = HostRateLimiter({"default": (1e6, 1e6)})
+    
+    server = serve_fixtures(args.delay)
+    port = server.server_address[1]
+    try:
+        print(f"{'run':<12}{'urls':>6}{'ok':>6}{'seconds':>10}{'urls/s':>9}")
+        for run, concurrency, output in (("sequential", 1, None), ("concurrent", args.concurrency, args.output)):
+            # Every URL is on one host, so the per-domain cap is the effective limit
+            crawler = JobCrawler(concurrency=concurrency, per_domain=concurrency, use_selenium=False, rate_limiter=unlimited)
+            summary = crawler.run(fixture_urls(port, args.urls, run), output)
+            seconds = summary["elapsed_seconds"]
+            print(f"{run:<12}{args.urls:>6}{summary['succeeded']:>6}{seconds:>10.2f}{args.urls / seconds:>9.1f}")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Throughput and latency of the local hashed n-gram embeddings, and of retrieval built on them
+
+    python -m benchmarks.bench_embeddings --chunks 100,1000,5000
+"""
+import argparse
+import time
+
+from langchain.vectorstores import FAISS
+
+from src.embeddings import HashedNgramEmbeddings
+from benchmarks.fakes import SAMPLE_JOB_DESCRIPTION, SAMPLE_RESUME, synthetic_text
+
+# About one Config.CHUNK_SIZE chunk of text
+CHUNK_WORDS = 160
+
+def best_ms(run, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark local embeddings and retrieval")
+    parser.add_argument("--chunks", default="100,1000,5000", help="Comma-separated corpus sizes in chunks")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the best is reported")
+    args = parser.parse_args(argv)
+    
+    embeddings = HashedNgramEmbeddings()
+    query = f"resume: {SAMPLE_RESUME[:500]} job: {SAMPLE_JOB_DESCRIPTION[:500]}"
+    print(f"{embeddings.model_id}, query embedding {best_ms(lambda: embeddings.embed_query(query), args.repeat * 20):.2f} ms")
+    print(f"{'chunks':>8}{'embed ms':>11}{'chunks/s':>11}{'index ms':>11}{'search ms':>11}")
+    
+    for size in (int(n) for n in args.chunks.split(",")):
+        texts = [synthetic_text(seed, CHUNK_WORDS) for seed in range(size)]
+        embed = best_ms(lambda: embeddings.embed_documents(texts), args.repeat)
+        index = best_ms(lambda: FAISS.from_texts(texts, embeddings), args.repeat)
+        vectorstore = FAISS.from_texts(texts, embeddings)
+        search = best_ms(lambda: vectorstore.similarity_search(query, k=3), args.repeat * 20)
+        print(f"{size:>8}{embed:>11.1f}{size / embed * 1000:>11.0f}{index:>11.1f}{search:>11.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Compare the HTML extraction backends over the saved pages in benchmarks/fixtures/
+
+    python -m benchmarks.bench_html_extraction --repeat 20
+"""
+import argparse
+import os
+import time
+
+from src.html_extractor import LXML_AVAILABLE, LxmlExtractor, SoupExtractor
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+def load_fixtures():
+    """Yield (name, url, html) for every fixture listed in urls.txt"""
+    with open(os.path.join(FIXTURES_DIR, "urls.txt"), 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            name, url = line.split()
+            with open(os.path.join(FIXTURES_DIR, name), 'r', encoding='utf-8') as page:
+                yield name, url, page.read()
+
+def time_extractor(extractor, html: str, url: str, repeat: int) -> float:
+    """Best-of-repeat wall time of one extraction, in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        extractor.extract(html, url)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark HTML extraction backends")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per fixture and backend")
+    args = parser.parse_args(argv)
+    
+    if not LXML_AVAILABLE:
+        raise SystemExit("lxml is not installed")
+    
+    soup, fast = SoupExtractor(), LxmlExtractor()
+    print(f"{'fixture':<28}{'size KB':>9}{'bs4 ms':>10}{'lxml ms':>10}{'speedup':>9}  same text")
+    
+    for name, url, html in load_fixtures():
+        soup_ms = time_extractor(soup, html, url, args.repeat)
+        fast_ms = time_extractor(fast, html, url, args.repeat)
+        same = " ".join(soup.extract(html, url).split()) == " ".join(fast.extract(html, url).split())
+        print(f"{name:<28}{len(html) / 1024:>9.0f}{soup_ms:>10.2f}{fast_ms:>10.2f}{soup_ms / fast_ms:>8.1f}x  {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Compare serial PDF rendering with the batch renderer's process pool
+
+    python -m benchmarks.bench_pdf_batch --letters 200 --workers 4
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+
+from src.config import Config
+from src.pdf_batch import BatchPDFRenderer
+from src.pdf_generator import PDFGenerator
+
+PARAGRAPH = (
+    "In my two years as a phlebotomy technician at a busy outpatient lab, I drew an average of "
+    "sixty patients a day while keeping specimen labeling errors below one in a thousand. "
+)
+
+def sample_letters(count: int):
+    """count distinct letters of about 350 words each"""
+    return [
+        (f"candidate-{i}", f"Dear Hiring Manager,\n\n" + "\n\n".join(PARAGRAPH * 4 for _ in range(4)) + f"\n\nSincerely,\nCandidate {i}")
+        for i in range(count)
+    ]
+
+def time_run(label: str, count: int, run):
+    started = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - started
+    print(f"{label:<28}{count:>8}{seconds:>10.2f}{count / seconds:>13.1f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark batch PDF rendering")
+    parser.add_argument("--letters", type=int, default=200, help="Letters per run")
+    parser.add_argument("--workers", type=int, default=Config.PDF_BATCH_WORKERS, help="Processes for the batch runs")
+    args = parser.parse_args(argv)
+    
+    letters = sample_letters(args.letters)
+    renderer = BatchPDFRenderer(workers=args.workers)
+    
+    def serial():
+        generator = PDFGenerator()
+        for _, text in letters:
+            generator.create_pdf(text)
+    
+    print(f"{os.cpu_count()} CPUs, {args.workers} workers")
+    print(f"{'run':<28}{'letters':>8}{'seconds':>10}{'letters/s':>13}")
+    time_run("serial create_pdf", args.letters, serial)
+    time_run("batch render", args.letters, lambda: sum(1 for _ in renderer.render(letters)))
+    with tempfile.TemporaryDirectory() as output_dir:
+        time_run("batch to files", args.letters, lambda: renderer.write_files(letters, output_dir))
+    time_run("batch to streamed zip", args.letters, lambda: renderer.write_zip(letters, io.BytesIO()))
+
+if __name__ == "__main__":
+    main()
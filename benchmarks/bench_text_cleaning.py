@@ -0,0 +1,51 @@
+"""
+Micro-benchmarks for scraped job text cleaning against the previous per-phrase loops
+
+    python -m benchmarks.bench_text_cleaning --repeat 50
+"""
+import argparse
+import re
+import timeit
+
+from src.config import Config
+from src.html_extractor import SoupExtractor
+from src.text_cleaning import UNWANTED_PHRASES, clean_job_text
+from benchmarks.bench_html_extraction import load_fixtures
+
+def legacy_requests_clean(text: str) -> str:
+    """The cleaning loop _extract_with_requests used before text_cleaning existed"""
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    text = ' '.join(chunk for chunk in chunks if chunk)
+    
+    text_lower = text.lower()
+    for phrase in UNWANTED_PHRASES:
+        if phrase in text_lower:
+            text = re.sub(re.escape(phrase), '', text, flags=re.IGNORECASE)
+    
+    text = ' '.join(text.split())
+    return text[:Config.MAX_JOB_DESCRIPTION_LENGTH]
+
+def sample_texts():
+    """Raw extracted text of every fixture page, plus the whole page text as a worst case"""
+    extractor = SoupExtractor()
+    for name, url, html in load_fixtures():
+        yield f"{name} (job content)", extractor.extract(html, url)
+        yield f"{name} (no selector)", extractor.extract(html, "https://unknown.example")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark job text cleaning")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per sample")
+    args = parser.parse_args(argv)
+    
+    limit = Config.MAX_JOB_DESCRIPTION_LENGTH
+    print(f"{'sample':<45}{'chars':>9}{'legacy ms':>11}{'single-pass ms':>16}{'speedup':>9}  same")
+    
+    for name, text in sample_texts():
+        legacy = min(timeit.repeat(lambda: legacy_requests_clean(text), number=1, repeat=args.repeat)) * 1000
+        single = min(timeit.repeat(lambda: clean_job_text(text, limit), number=1, repeat=args.repeat)) * 1000
+        same = legacy_requests_clean(text) == clean_job_text(text, limit)
+        print(f"{name:<45}{len(text):>9}{legacy:>11.3f}{single:>16.3f}{legacy / single:>8.1f}x  {same}")
+
+if __name__ == "__main__":
+    main()
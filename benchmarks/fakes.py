@@ -0,0 +1,75 @@
+"""
+Deterministic, offline stand-ins for the Gemini chat model and embeddings
+
+install_fakes() puts them into shared_resources before anything asks for the real clients,
+so CoverLetterGenerator and DocumentProcessor run unchanged without an API key or network.
+"""
+import os
+import random
+
+from langchain_community.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src import shared_resources
+
+# Same dimensionality as models/embedding-001
+EMBEDDING_SIZE = 768
+
+WORDS = (
+    "patient care specimen collection phlebotomy laboratory clinic hospital accuracy safety "
+    "communication team schedule records compliance training certification experience "
+    "venipuncture labeling procedures infection control customer service empathy "
+    "volunteer healthcare technician manager growth mission values results"
+).split()
+
+SAMPLE_LETTER = (
+    "Dear Hiring Manager,\n\n"
+    "As a certified phlebotomy technician with two years at a busy outpatient lab, I drew an average "
+    "of sixty patients a day while keeping labeling errors below one in a thousand.\n\n"
+    "Your clinic's focus on patient-centred care matches how I work: calm, precise and friendly, "
+    "even during the morning rush.\n\n"
+    "I would welcome the chance to bring that consistency to your team.\n\n"
+    "Sincerely,\nJordan Lee"
+)
+
+SAMPLE_RESUME = (
+    "Jordan Lee\nCertified Phlebotomy Technician (CPT)\n\n"
+    "Experience\nQuest Diagnostics, Phlebotomy Technician, 2022-2024\n"
+    "- Performed 60+ venipunctures daily with a 99.9% first-stick success rate\n"
+    "- Trained four new hires on specimen labeling and infection control\n\n"
+    "Education\nCity College, Phlebotomy Certificate, 2022\n"
+)
+
+SAMPLE_JOB_DESCRIPTION = (
+    "Phlebotomist at Riverside Health\n\n"
+    "Riverside Health is hiring a full-time Phlebotomist for our downtown outpatient clinic. "
+    "You will collect blood specimens, verify patient identity, label and process samples, and "
+    "keep accurate records. Requirements: phlebotomy certification, one year of experience, "
+    "excellent communication skills and a commitment to patient safety."
+)
+
+def install_fakes(letter: str = SAMPLE_LETTER, llm_seconds: float = 0.0):
+    """Replace the shared LLM and embeddings with local fakes and build the static layer with them
+    
+    llm_seconds spreads that much artificial latency over each streamed response.
+    """
+    os.environ.setdefault("GOOGLE_API_KEY", "offline")
+    shared_resources._resources["embeddings"] = DeterministicFakeEmbedding(size=EMBEDDING_SIZE)
+    # The fake model streams one character per chunk and sleeps before each
+    shared_resources._resources["llm"] = FakeListChatModel(responses=[letter], sleep=llm_seconds / len(letter) if llm_seconds else None)
+    
+    # The prebuilt static index holds real Gemini vectors, so build the layer from the fakes instead
+    from src.document_processor import DocumentProcessor
+    processor = DocumentProcessor()
+    documents = processor._load_static_documents()
+    shared_resources._resources["static_layer"] = (processor._create_vectorstore(documents) if documents else None, len(documents))
+
+def synthetic_text(seed: int, words: int) -> str:
+    """Reproducible filler text drawn from a healthcare vocabulary"""
+    rng = random.Random(seed)
+    sentences = []
+    while words > 0:
+        length = min(words, rng.randint(8, 20))
+        sentences.append(" ".join(rng.choice(WORDS) for _ in range(length)).capitalize() + ".")
+        words -= length
+    return " ".join(sentences)
@@ -0,0 +1,240 @@
+"""
+Concurrent-session load test of app.py, driven headlessly through Streamlit's AppTest
+
+Every simulated user opens the app, enters a job URL (served by a local fixture server),
+uploads a resume and a context file, generates a cover letter, prepares its PDF, then
+improves a pasted letter. The LLM and embeddings are the offline fakes from benchmarks.fakes.
+
+    python -m benchmarks.load_test --sessions 1,4,8 --llm-seconds 1.0 --output load.json
+
+Reports p50/p95/p99 latency per step and peak process RSS for each concurrency level.
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from src import metrics, web_scraper
+from src.constants import (
+    LABEL_GENERATE_COVER_LETTER, LABEL_JOB_URL, LABEL_RESUME_UPLOAD, TEXT_MIME_TYPE
+)
+from src.rate_limiter import HostRateLimiter
+
+from .bench_crawler import serve_fixtures
+from .bench_html_extraction import load_fixtures
+from .fakes import SAMPLE_LETTER, SAMPLE_RESUME, install_fakes, synthetic_text
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+STEPS = ("open", "scrape", "upload", "generate", "prepare_pdf", "open_improve", "improve")
+MB = 1024 * 1024
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+def share_test_runtime():
+    """Let AppTest runs overlap in one process
+    
+    Each AppTest run installs a mock Runtime singleton and clears it when it finishes, which
+    breaks any run still in progress in another thread. Until the next run installs its own,
+    the last mock keeps serving, as the one Runtime does in a real server.
+    """
+    from streamlit.runtime.runtime import Runtime
+    latest = {}
+    
+    def instance(cls):
+        if cls._instance is not None:
+            latest["runtime"] = cls._instance
+            return cls._instance
+        if "runtime" in latest:
+            return latest["runtime"]
+        raise RuntimeError("Runtime hasn't been created!")
+    
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or "runtime" in latest)
+
+class RSSMonitor:
+    """Samples process RSS from a background thread and keeps the peak"""
+    
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self.peak = metrics.rss_bytes() or 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+    
+    def __enter__(self):
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+    
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, metrics.rss_bytes() or 0)
+
+class Session:
+    """One simulated user; records the wall time of every app rerun it triggers"""
+    
+    def __init__(self, index: int, job_url: str, timeout: float, tag: str):
+        from streamlit.testing.v1 import AppTest
+        self.index = index
+        self.job_url = job_url
+        # Distinct users send distinct text, so no session is served from another's response cache entry
+        self.tag = f"{tag}-{index}"
+        self.app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.timings: Dict[str, float] = {}
+        self.errors: List[str] = []
+    
+    def step(self, name: str, action):
+        started = time.perf_counter()
+        action()
+        self.timings[name] = time.perf_counter() - started
+        # Exceptions and st.error messages both count as a failed step
+        problems = [e.value for e in self.app.exception] + [e.value for e in self.app.error]
+        if problems:
+            self.errors.append(f"{name}: {problems[0]}")
+    
+    def run(self):
+        app = self.app
+        self.step("open", app.run)
+        self.step("scrape", lambda: self._widget(app.text_input, LABEL_JOB_URL).input(self.job_url).run())
+        
+        def upload():
+            self._widget(app.file_uploader, LABEL_RESUME_UPLOAD).set_value(
+                ("resume.txt", f"{SAMPLE_RESUME}\nReference: {self.tag}\n".encode("utf-8"), TEXT_MIME_TYPE)
+            )
+            context = synthetic_text(self.index, 1500).encode("utf-8")
+            self._widget(app.file_uploader, "Upload context files").set_value(
+                [(f"notes-{self.index}.txt", context, TEXT_MIME_TYPE)]
+            )
+            app.run()
+        self.step("upload", upload)
+        
+        self.step("generate", lambda: self._widget(app.button, LABEL_GENERATE_COVER_LETTER).click().run())
+        self.step("prepare_pdf", lambda: app.button(key="generated_prepare_pdf").click().run())
+        
+        def open_improve():
+            app.selectbox[0].select("Improve Cover Letter").run()
+            self._widget(app.text_area, "Paste your cover letter here").input(f"{SAMPLE_LETTER}\n\nRef. {self.tag}").run()
+        self.step("open_improve", open_improve)
+        self.step("improve", lambda: self._widget(app.button, "✨ Improve Cover Letter").click().run())
+    
+    @staticmethod
+    def _widget(widgets, label: str):
+        for widget in widgets:
+            if widget.label == label:
+                return widget
+        raise Exception(f"No widget labelled {label!r} on the page")
+
+def run_level(sessions: int, port: int, fixture_names: List[str], timeout: float, tag: str) -> dict:
+    """Run sessions users at once and summarise latencies and memory"""
+    gc.collect()
+    rss_before = metrics.rss_bytes() or 0
+    users = [
+        Session(i, f"http://127.0.0.1:{port}/{fixture_names[i % len(fixture_names)]}?run={tag}&session={i}", timeout, tag)
+        for i in range(sessions)
+    ]
+    start = threading.Barrier(sessions)
+    
+    def drive(user: Session):
+        start.wait()
+        try:
+            user.run()
+        except Exception as e:
+            user.errors.append(f"aborted: {e}")
+    
+    with RSSMonitor() as monitor:
+        threads = [threading.Thread(target=drive, args=(user,)) for user in users]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+    
+    gc.collect()
+    rss_after = metrics.rss_bytes() or 0
+    latencies = defaultdict(list)
+    for user in users:
+        for step, seconds in user.timings.items():
+            latencies[step].append(seconds)
+    
+    return {
+        "sessions": sessions,
+        "elapsed_seconds": round(elapsed, 3),
+        "errors": [f"session {user.index} {error}" for user in users for error in user.errors],
+        "rss_before_mb": round(rss_before / MB, 1),
+        "peak_rss_mb": round(monitor.peak / MB, 1),
+        "peak_rss_per_session_mb": round((monitor.peak - rss_before) / MB / sessions, 2),
+        # Memory still held after every session finished and gc ran, e.g. session state and caches
+        "retained_mb": round((rss_after - rss_before) / MB, 1),
+        "steps": {
+            step: {
+                "count": len(latencies[step]),
+                "p50_ms": round(percentile(latencies[step], 50) * 1000, 1),
+                "p95_ms": round(percentile(latencies[step], 95) * 1000, 1),
+                "p99_ms": round(percentile(latencies[step], 99) * 1000, 1),
+                "mean_ms": round(statistics.mean(latencies[step]) * 1000, 1)
+            }
+            for step in STEPS if latencies[step]
+        }
+    }
+
+def print_level(result: dict):
+    print(
+        f"\n{result['sessions']} concurrent sessions in {result['elapsed_seconds']:.1f}s, "
+        f"peak RSS {result['peak_rss_mb']:.0f} MB ({result['peak_rss_per_session_mb']:+.1f} MB/session), "
+        f"retained {result['retained_mb']:+.1f} MB, {len(result['errors'])} errors"
+    )
+    print(f"{'step':<14}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for step, stats in result["steps"].items():
+        print(f"{step:<14}{stats['count']:>7}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}")
+    for error in result["errors"][:5]:
+        print(f"  ⚠️ {error}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test app.py with concurrent headless sessions")
+    parser.add_argument("--sessions", default="1,4,8", help="Comma-separated concurrency levels, run one after another")
+    parser.add_argument("--llm-seconds", type=float, default=0.5, help="Artificial latency of each fake LLM response")
+    parser.add_argument("--http-delay", type=float, default=0.1, help="Seconds the fixture server waits before each page")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds one app rerun may take before it fails")
+    parser.add_argument("--output", help="Write every level's results to this JSON file")
+    args = parser.parse_args(argv)
+    
+    from streamlit.testing.v1 import AppTest
+    if not hasattr(AppTest, "file_uploader"):
+        raise Exception("This Streamlit version's AppTest cannot drive file uploads; upgrade Streamlit to run the load test")
+    
+    share_test_runtime()
+    install_fakes(SAMPLE_LETTER, args.llm_seconds)
+    # Every page is on one local host, so the per-host politeness limit would serialize all sessions
+    web_scraper.host_rate_limiter = HostRateLimiter({"default": (1e6, 1e6)})
+    fixture_names = [name for name, _, _ in load_fixtures()]
+    server = serve_fixtures(args.http_delay)
+    
+    results = []
+    try:
+        # One untimed session first, so imports and process-wide resources aren't charged to the first level
+        run_level(1, server.server_address[1], fixture_names, args.timeout, "warmup")
+        for level, sessions in enumerate(int(n) for n in args.sessions.split(",")):
+            result = run_level(sessions, server.server_address[1], fixture_names, args.timeout, str(level))
+            print_level(result)
+            results.append(result)
+    finally:
+        server.shutdown()
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"llm_seconds": args.llm_seconds, "http_delay": args.http_delay, "levels": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
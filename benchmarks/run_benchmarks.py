@@ -0,0 +1,205 @@
+"""
+Offline benchmark suite: document indexing, prompt assembly, PDF rendering and end-to-end
+generation, with a fake LLM and fake embeddings, compared against a stored baseline
+
+    python -m benchmarks.run_benchmarks                      # compare with benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --save-baseline      # record a new baseline
+    python -m benchmarks.run_benchmarks --output results.json --threshold 0.5
+
+Exits with status 1 when any benchmark's fastest run is slower than its baseline by more
+than its threshold; the minimum is far less sensitive to a busy machine than the median.
+Baselines are machine specific; record one on the machine that runs the check.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, Optional
+
+from benchmarks.fakes import (
+    SAMPLE_JOB_DESCRIPTION, SAMPLE_LETTER, SAMPLE_RESUME,
+    install_fakes, synthetic_text
+)
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+CORPUS_SIZES = (10, 100, 500)
+DOCUMENT_WORDS = 400
+DEFAULT_THRESHOLD = 0.25
+# Allowed slowdown per benchmark, as a fraction of the baseline minimum; sub-millisecond
+# benchmarks are noisier, so they get more headroom
+THRESHOLDS = {
+    "extract_company_name": 0.5,
+    "extract_job_title": 0.5,
+    "build_prompt": 0.5
+}
+
+def measure(run: Callable, repeat: int, setup: Optional[Callable] = None, inner: int = 1) -> dict:
+    """Time run() repeat times after one warm-up and report milliseconds per call
+    
+    setup(), if given, runs untimed before each timing and its result is passed to run().
+    Microsecond-scale calls are repeated inner times per timing so clock noise averages out.
+    """
+    timings = []
+    for i in range(repeat + 1):
+        state = setup() if setup else None
+        # As in timeit, a collection triggered by earlier garbage shouldn't land in one run
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            for _ in range(inner):
+                run(state) if setup else run()
+            elapsed = (time.perf_counter() - started) / inner
+        finally:
+            gc.enable()
+        if i:
+            timings.append(elapsed * 1000)
+    return {
+        "median_ms": round(statistics.median(timings), 4),
+        "min_ms": round(min(timings), 4),
+        "mean_ms": round(statistics.mean(timings), 4),
+        "runs": repeat * inner
+    }
+
+def corpus(size: int):
+    from langchain.schema import Document
+    return [Document(page_content=synthetic_text(seed, DOCUMENT_WORDS), metadata={"source": f"doc-{seed}"}) for seed in range(size)]
+
+def document_benchmarks(sizes, repeat: int) -> Dict[str, dict]:
+    from src.document_processor import DocumentProcessor
+    
+    results = {}
+    for size in sizes:
+        documents = corpus(size)
+        # Larger corpora take proportionally longer per run, so they get fewer runs
+        runs = max(3, repeat * 10 // size)
+        processor = DocumentProcessor()
+        splits = processor.text_splitter.split_documents(documents)
+        
+        results[f"chunk_{size}_docs"] = measure(lambda: processor.text_splitter.split_documents(documents), runs)
+        results[f"index_build_{size}_docs"] = measure(
+            lambda fresh: fresh._add_to_context_layer("bench", splits),
+            runs,
+            setup=DocumentProcessor
+        )
+        
+        processor._add_to_context_layer("bench", splits)
+        query = f"resume: {SAMPLE_RESUME[:500]} job: {SAMPLE_JOB_DESCRIPTION[:500]}"
+        results[f"search_{size}_docs"] = measure(lambda: processor.search_similar_documents(query), repeat, inner=20)
+    return results
+
+def generator_benchmarks(repeat: int) -> Dict[str, dict]:
+    from src.cover_letter_generator import CoverLetterGenerator
+    from src.pdf_generator import PDFGenerator
+    
+    generator = CoverLetterGenerator()
+    generator.load_static_content()
+    # Every end-to-end run must reach the (fake) model rather than the response cache
+    generator.response_cache = None
+    system_prompt = generator._get_system_prompt()
+    context = generator._get_context_from_documents(SAMPLE_RESUME, SAMPLE_JOB_DESCRIPTION)
+    pdf_generator = PDFGenerator()
+    
+    return {
+        "build_prompt": measure(
+            lambda: generator._build_prompt(system_prompt, context, SAMPLE_RESUME, SAMPLE_JOB_DESCRIPTION, "", ""),
+            repeat, inner=10
+        ),
+        "extract_company_name": measure(lambda: generator._extract_company_name(SAMPLE_JOB_DESCRIPTION, ""), repeat, inner=1000),
+        "extract_job_title": measure(lambda: generator._extract_job_title(SAMPLE_JOB_DESCRIPTION, ""), repeat, inner=1000),
+        "create_pdf": measure(lambda: pdf_generator.create_pdf(SAMPLE_LETTER), repeat),
+        "generate_cover_letter": measure(lambda: generator.generate_cover_letter(SAMPLE_RESUME, SAMPLE_JOB_DESCRIPTION), repeat, inner=5)
+    }
+
+def best_of(rounds: list) -> dict:
+    """Combine the same benchmark from several rounds: the fastest run and the median of medians"""
+    return {
+        "median_ms": round(statistics.median(r["median_ms"] for r in rounds), 4),
+        "min_ms": min(r["min_ms"] for r in rounds),
+        "mean_ms": round(statistics.mean(r["mean_ms"] for r in rounds), 4),
+        "runs": sum(r["runs"] for r in rounds)
+    }
+
+def run_suite(sizes=CORPUS_SIZES, repeat: int = 20, rounds: int = 3) -> dict:
+    """Run every benchmark rounds times, so a burst of load on a shared machine only spoils one round"""
+    install_fakes()
+    per_round = []
+    for _ in range(rounds):
+        results = document_benchmarks(sizes, repeat)
+        results.update(generator_benchmarks(repeat))
+        per_round.append(results)
+    
+    results = {name: best_of([r[name] for r in per_round]) for name in per_round[0]}
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "rounds": rounds,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        "results": results
+    }
+
+def compare(results: dict, baseline: dict, threshold: Optional[float] = None) -> list:
+    """Return (name, baseline ms, current ms, change) for every benchmark over its threshold"""
+    regressions = []
+    print(f"{'benchmark':<28}{'baseline ms':>13}{'current ms':>13}{'change':>9}")
+    for name, current in results["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            print(f"{name:<28}{'-':>13}{current['min_ms']:>13.3f}{'new':>9}")
+            continue
+        
+        change = current["min_ms"] / previous["min_ms"] - 1 if previous["min_ms"] else 0.0
+        allowed = threshold if threshold is not None else THRESHOLDS.get(name, DEFAULT_THRESHOLD)
+        flag = "  REGRESSION" if change > allowed else ""
+        print(f"{name:<28}{previous['min_ms']:>13.3f}{current['min_ms']:>13.3f}{change:>+9.0%}{flag}")
+        if flag:
+            regressions.append((name, previous["min_ms"], current["min_ms"], change))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per benchmark (more for fast ones, fewer for large corpora)")
+    parser.add_argument("--rounds", type=int, default=3, help="Times to run the whole suite; each benchmark keeps its best round")
+    parser.add_argument("--sizes", default=",".join(map(str, CORPUS_SIZES)), help="Comma-separated corpus sizes in documents")
+    parser.add_argument("--output", help="Also write the results JSON to this path")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, help="Allowed slowdown for every benchmark, e.g. 0.25 for 25%%")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline instead of comparing")
+    args = parser.parse_args(argv)
+    
+    results = run_suite(tuple(int(size) for size in args.sizes.split(",")), args.repeat, args.rounds)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"✅ Saved baseline with {len(results['results'])} benchmarks to {args.baseline}")
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print(json.dumps(results, indent=2))
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one")
+        return 0
+    
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"❌ {len(regressions)} benchmark(s) regressed")
+        return 1
+    print("✅ No regressions")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,7 @@ Setup script for Cover Letter Generator
 
 import os
 import shutil
+import sys
 
 def setup_environment():
     """Set up the environment file"""
@@ -26,7 +27,20 @@ def create_directories():
         os.makedirs(directory, exist_ok=True)
         print(f"✅ Created directory: {directory}")
 
+def build_index(argv):
+    """Build the static content index artifact loaded at startup"""
+    from src.static_index import main as build_static_index
+    build_static_index(argv)
+
+COMMANDS = {
+    'build-index': build_index
+}
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        COMMANDS[sys.argv[1]](sys.argv[2:])
+        return
+    
     print("🚀 Setting up Cover Letter Generator...")
     create_directories()
     setup_environment()
@@ -34,7 +48,8 @@ def main():
     print("\nNext steps:")
     print("1. Edit .env file and add your Google API key")
     print("2. Add your own content files to static_content/ folder")
-    print("3. Run: streamlit run app.py")
+    print("3. Optional: python setup.py build-index")
+    print("4. Run: streamlit run app.py")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,198 @@
+"""
+Bulk cover letter generation from a JSONL file of candidate/posting records
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from .config import Config
+from .pdf_batch import pdf_filename
+from .performance_config import PerformanceConfig
+from .rate_limiter import TokenBucket
+
+class BulkCoverLetterGenerator:
+    """Runs many generations through llm.ainvoke with bounded concurrency, a rate limit and per-item retry
+    
+    Each input record is a JSON object with:
+        id                       optional, defaults to the line number
+        resume | resume_path     resume text, or a path to a .txt/.pdf resume
+        job_description          optional when job_url is given
+        job_url                  optional, scraped when job_description is empty
+        overrides                optional job_title, company_name and additional_context
+    """
+    
+    def __init__(
+        self,
+        generator=None,
+        concurrency: int = Config.BULK_CONCURRENCY,
+        requests_per_minute: float = Config.BULK_REQUESTS_PER_MINUTE,
+        max_retries: int = PerformanceConfig.MAX_RETRIES
+    ):
+        if generator is None:
+            from .cover_letter_generator import CoverLetterGenerator
+            generator = CoverLetterGenerator()
+            generator.load_static_content()
+        
+        self.generator = generator
+        self.concurrency = concurrency
+        self.requests_per_minute = requests_per_minute
+        self.max_retries = max_retries
+        self._job_descriptions: Dict[str, asyncio.Task] = {}
+        # PDF file names used in the current run, so records with clashing ids don't overwrite each other
+        self._pdf_names: Set[str] = set()
+    
+    def run(self, records: Iterable[dict], output_path: Optional[str] = None, pdf_dir: Optional[str] = None) -> dict:
+        return asyncio.run(self.generate(records, output_path, pdf_dir))
+    
+    async def generate(self, records: Iterable[dict], output_path: Optional[str] = None, pdf_dir: Optional[str] = None) -> dict:
+        """Generate a letter per record, writing each result as soon as it finishes"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limiter = TokenBucket.per_minute(self.requests_per_minute)
+        self._job_descriptions = {}
+        self._pdf_names = set()
+        
+        if pdf_dir:
+            os.makedirs(pdf_dir, exist_ok=True)
+        
+        output = open(output_path, 'w', encoding='utf-8') if output_path else None
+        summary = {"succeeded": 0, "failed": 0}
+        started = time.perf_counter()
+        
+        async def process(index: int, record: dict):
+            async with semaphore:
+                result = await self._process_record(index, record, limiter)
+            
+            if result["status"] == "ok" and pdf_dir:
+                try:
+                    await self._write_pdf(result, pdf_dir)
+                except Exception as e:
+                    # The letter is kept in the row; only this record is marked failed
+                    result["status"] = "error"
+                    result["error"] = f"PDF write failed: {e}"
+            
+            if result["status"] == "ok":
+                summary["succeeded"] += 1
+            else:
+                summary["failed"] += 1
+            
+            if output:
+                output.write(json.dumps(result) + "\n")
+                output.flush()
+        
+        try:
+            await asyncio.gather(*(process(i, record) for i, record in enumerate(records, 1)))
+        finally:
+            if output:
+                output.close()
+        
+        summary["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        return summary
+    
+    async def _process_record(self, index: int, record: dict, limiter: TokenBucket) -> dict:
+        record_id = str(record.get("id", index))
+        result = {"id": record_id, "status": "error", "attempts": 0}
+        started = time.perf_counter()
+        
+        try:
+            resume_text = self._load_resume(record)
+            job_url = record.get("job_url", "")
+            job_description = record.get("job_description", "")
+            if not job_description and job_url:
+                job_description = await self._get_job_description(job_url)
+            overrides = record.get("overrides", {})
+            
+            for attempt in range(1, self.max_retries + 2):
+                result["attempts"] = attempt
+                await limiter.acquire_async()
+                try:
+                    result["cover_letter"] = await self.generator.agenerate_cover_letter(
+                        resume_text,
+                        job_description,
+                        job_url,
+                        overrides.get("additional_context", ""),
+                        overrides.get("job_title", ""),
+                        overrides.get("company_name", "")
+                    )
+                    result["status"] = "ok"
+                    break
+                except Exception as e:
+                    result["error"] = str(e)
+                    if attempt <= self.max_retries:
+                        # Exponential backoff with jitter so retries don't arrive in lockstep
+                        await asyncio.sleep(2 ** (attempt - 1) + random.uniform(0, 1))
+        except Exception as e:
+            result["error"] = str(e)
+        
+        if result["status"] == "ok":
+            result.pop("error", None)
+        result["latency_seconds"] = round(time.perf_counter() - started, 3)
+        return result
+    
+    async def _get_job_description(self, job_url: str) -> str:
+        # Records often share a posting, so each URL is only scraped once per run
+        if job_url not in self._job_descriptions:
+            self._job_descriptions[job_url] = asyncio.create_task(
+                asyncio.to_thread(self.generator.extract_job_info, job_url)
+            )
+        return await self._job_descriptions[job_url]
+    
+    async def _write_pdf(self, result: dict, pdf_dir: str):
+        path = os.path.join(pdf_dir, pdf_filename(result["id"], self._pdf_names))
+        pdf_data = await asyncio.to_thread(self.generator.create_pdf, result["cover_letter"])
+        with open(path, 'wb') as f:
+            f.write(pdf_data)
+        result["pdf_path"] = path
+    
+    @staticmethod
+    def _load_resume(record: dict) -> str:
+        if record.get("resume"):
+            return record["resume"]
+        
+        resume_path = record.get("resume_path")
+        if not resume_path:
+            raise Exception("Record has no resume or resume_path")
+        
+        if resume_path.endswith('.pdf'):
+            # Records often share a resume; it is parsed once per distinct file
+            from .pdf_ingestion import extract_pdf_text
+            with open(resume_path, 'rb') as f:
+                return extract_pdf_text(f.read())
+        
+        with open(resume_path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+def load_records(path: str) -> List[dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate cover letters in bulk from a JSONL file")
+    parser.add_argument("input", help="JSONL file with one candidate/posting record per line")
+    parser.add_argument("--output", help="JSONL file to stream results to")
+    parser.add_argument("--pdf-dir", help="Directory to write one PDF per successful letter to")
+    parser.add_argument("--concurrency", type=int, default=Config.BULK_CONCURRENCY, help="Maximum generations in flight")
+    parser.add_argument("--rpm", type=float, default=Config.BULK_REQUESTS_PER_MINUTE, help="Maximum LLM requests per minute")
+    parser.add_argument("--retries", type=int, default=PerformanceConfig.MAX_RETRIES, help="Retries per record after the first attempt")
+    args = parser.parse_args(argv)
+    
+    if not args.output and not args.pdf_dir:
+        parser.error("at least one of --output or --pdf-dir is required")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.rpm <= 0:
+        parser.error("--rpm must be greater than 0")
+    
+    bulk = BulkCoverLetterGenerator(
+        concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+        max_retries=args.retries
+    )
+    summary = bulk.run(load_records(args.input), args.output, args.pdf_dir)
+    print(f"✅ Generated {summary['succeeded']} cover letters, {summary['failed']} failed in {summary['elapsed_seconds']}s")
+
+if __name__ == "__main__":
+    main()
@@ -13,13 +13,76 @@ class Config:
     MAX_SIMILARITY_SEARCH_RESULTS = 3
     ENABLE_VECTOR_SEARCH = True
     
+    STATIC_CONTENT_DIR = "static_content"
+    STATIC_INDEX_DIR = os.getenv("STATIC_INDEX_DIR", "static_index")
+    # Seconds before a static layer whose embedding step failed is built again
+    STATIC_LAYER_RETRY_SECONDS = 60
+    
+    EMBEDDING_MODEL = "models/embedding-001"
+    # "gemini" calls the embedding API; "local" hashes character n-grams on the CPU and works offline
+    EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "gemini")
+    LOCAL_EMBEDDING_DIMENSIONS = 1024
+    LOCAL_EMBEDDING_NGRAM_RANGE = (3, 5)
+    ENABLE_EMBEDDING_CACHE = True
+    EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", ".cache/embeddings")
+    
     REQUEST_TIMEOUT = 5  # Reduced from 10 to 5 seconds for faster response
     MAX_JOB_DESCRIPTION_LENGTH = 3000
     
+    HTML_EXTRACTOR_BACKEND = "lxml"  # "lxml", or "bs4" for the pure-Python html.parser path
+    
+    # Per-domain (requests per second, burst size); requests only wait once a burst is used up
+    SCRAPER_RATE_LIMITS = {
+        "indeed.com": (0.5, 2),
+        "linkedin.com": (0.2, 2),
+        "glassdoor.com": (0.25, 2),
+        "default": (1.0, 3)
+    }
+    
+    # Hedged extraction: start the browser if requests hasn't returned after a per-domain delay
+    ENABLE_HEDGED_EXTRACTION = True
+    HEDGE_DELAY_SECONDS = 1.5  # Until a domain has HEDGE_MIN_SAMPLES requests attempts
+    HEDGE_MIN_DELAY_SECONDS = 0.25
+    HEDGE_MAX_DELAY_SECONDS = 4.0
+    HEDGE_MIN_SAMPLES = 3
+    HEDGE_SKIP_REQUESTS_BELOW = 0.2  # Requests success rate below which the browser goes first
+    HEDGE_MAX_WORKERS = 8
+    
+    SELENIUM_POOL_SIZE = 2
+    SELENIUM_MAX_PAGES_PER_DRIVER = 20
+    SELENIUM_LEASE_TIMEOUT = 30
+    SELENIUM_PREWARM_DRIVERS = 1
+    
+    HTTP_POOL_CONNECTIONS = 10
+    HTTP_POOL_MAXSIZE = 20
+    HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", ".cache/http")
+    HTTP_CACHE_TTL_SECONDS = 7 * 24 * 3600  # How long validators are kept for revalidation
+    JOB_EXTRACTION_CACHE_TTL_SECONDS = 3600
+    
+    PROMPT_TOKEN_BUDGET = 3000  # Estimated input tokens per generation prompt
+    
+    RESPONSE_CACHE_MAX_ENTRIES = 128
+    RESPONSE_CACHE_DIR = os.getenv("RESPONSE_CACHE_DIR")  # Disk tier is off unless a directory is set
+    RESPONSE_CACHE_MAX_DISK_MB = 50
+    
+    BULK_CONCURRENCY = 4
+    BULK_REQUESTS_PER_MINUTE = 60
+    
+    # PDF text extraction: documents with at least PDF_PARALLEL_MIN_PAGES pages are split
+    # into page ranges across INGESTION_WORKERS processes
+    INGESTION_WORKERS = min(4, os.cpu_count() or 1)
+    PDF_PARALLEL_MIN_PAGES = 16
+    
+    CRAWLER_CONCURRENCY = 16  # URLs in flight across all domains
+    CRAWLER_PER_DOMAIN_CONCURRENCY = 2
+    
     PDF_PAGE_SIZE = "letter"
     PDF_TITLE_FONT_SIZE = 16
     PDF_BODY_FONT_SIZE = 12
     PDF_SPACING = 12
+    PDF_CACHE_MAX_MB = 16
+    PDF_BATCH_WORKERS = os.cpu_count() or 1
+    PDF_BATCH_CHUNKSIZE = 8  # Letters sent to a rendering worker per task
     
     @classmethod
     def validate_api_key(cls):
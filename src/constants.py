@@ -6,6 +6,8 @@ ERROR_API_KEY_MISSING = "Please set your GOOGLE_API_KEY environment variable"
 ERROR_RESUME_MISSING = "Please provide your resume content"
 ERROR_GENERATING_COVER_LETTER = "Error generating cover letter: {error}"
 ERROR_EXTRACTING_JOB_INFO = "Error extracting job info: {error}"
+ERROR_CREATING_PDF = "Error creating PDF: {error}"
+ERROR_MEMORY_PRESSURE = "The server is low on memory right now. Please try again in a minute."
 
 SUPPORTED_FILE_TYPES = ['pdf', 'txt']
 PDF_MIME_TYPE = "application/pdf"
@@ -17,16 +19,19 @@ DEFAULT_TEMPERATURE = 0.7
 
 LABEL_GENERATE_COVER_LETTER = "🚀 Generate Cover Letter"
 LABEL_DOWNLOAD_PDF = "📥 Download PDF"
+LABEL_PREPARE_PDF = "📄 Prepare PDF"
 LABEL_JOB_URL = "Job URL (optional)"
 LABEL_JOB_DESCRIPTION = "Job Description (optional)"
 LABEL_RESUME_CONTENT = "Resume Content"
 LABEL_RESUME_UPLOAD = "Or Upload Resume File"
 LABEL_ADDITIONAL_CONTEXT = "Additional Context (optional)"
 LABEL_COVER_LETTER = "Cover Letter"
+LABEL_FRESH_VARIANT = "🎲 Generate a fresh variant"
 
 HELP_JOB_URL = "Paste the job posting URL to automatically extract job description"
 HELP_JOB_DESCRIPTION = "Paste the job description or requirements here (optional)"
 HELP_RESUME_CONTENT = "Paste your resume content here. Include your skills, experience, education, and any relevant details."
 HELP_RESUME_UPLOAD = "Upload a PDF or text file containing your resume"
 HELP_ADDITIONAL_CONTEXT = "Any additional information you'd like to include in the cover letter"
+HELP_FRESH_VARIANT = "Ask the AI for a new version instead of reusing the result for identical inputs"
 HELP_CONTEXT_FILES = "Upload additional PDF or text files with examples or instructions"
@@ -0,0 +1,43 @@
+"""
+Parsing and chunk splitting of uploaded context files, run inside ingestion worker processes
+"""
+from typing import List, Optional, Tuple
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from .pdf_ingestion import read_pdf_pages
+
+PDF_MIME_TYPE = "application/pdf"
+TEXT_MIME_TYPE = "text/plain"
+
+# (chunk text, metadata) pairs are all that cross the process boundary
+ChunkRecord = Tuple[str, dict]
+
+def split_upload(
+    data: bytes,
+    name: str,
+    mime_type: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    pages: Optional[List[str]] = None
+) -> Tuple[int, List[ChunkRecord], Optional[List[str]]]:
+    """Return (number of documents, chunk records, newly parsed PDF pages) for one uploaded file
+    
+    Chunks and metadata match what DocumentProcessor gets from loading the file in-process
+    and running split_documents with the same splitter settings. pages, when the parent
+    already has the PDF's text memoized, skips parsing; otherwise the parsed pages are
+    returned so the parent can memoize them (the worker's own cache dies with it).
+    """
+    parsed = None
+    if mime_type == PDF_MIME_TYPE:
+        if pages is None:
+            pages = parsed = read_pdf_pages(data)
+        documents = [(text, {"source": name, "page": page}) for page, text in enumerate(pages)]
+    elif mime_type == TEXT_MIME_TYPE:
+        documents = [(data.decode("utf-8"), {})]
+    else:
+        return 0, [], None
+    
+    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    chunks = [(chunk, dict(metadata)) for text, metadata in documents for chunk in splitter.split_text(text)]
+    return len(documents), chunks, parsed
@@ -1,32 +1,43 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
+import asyncio
+import time
+from typing import Iterator, Optional, Tuple
 from langchain.schema import HumanMessage
 from langchain.memory import ConversationBufferMemory
 
 from .config import Config
+from .performance_config import PerformanceConfig
+from . import memory_governor, metrics, shared_resources
 from .document_processor import DocumentProcessor
+from .prompt_builder import PromptAssembler
 from .web_scraper import WebScraper
-from .pdf_generator import PDFGenerator
 
 class CoverLetterGenerator:
     def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model=Config.GEMINI_MODEL,
-            temperature=Config.GEMINI_TEMPERATURE,
-            google_api_key=Config.GOOGLE_API_KEY
-        )
+        # The LLM client, embeddings, static index and PDF styles are shared across
+        # sessions; only the uploaded-context layer of the document processor is per instance
+        self.llm = shared_resources.get_llm()
         self.memory = ConversationBufferMemory(
             memory_key="chat_history",
             return_messages=True
         )
         self.document_processor = DocumentProcessor()
         self.web_scraper = WebScraper()
-        self.pdf_generator = PDFGenerator()
+        self.pdf_generator = shared_resources.get_pdf_generator()
+        self.pdf_cache = shared_resources.get_pdf_cache()
+        self.response_cache = shared_resources.get_response_cache() if PerformanceConfig.ENABLE_REQUEST_CACHING else None
+        # Per-section input token counts of the most recently built prompt
+        self.last_prompt_stats = {}
     
     def load_static_content(self) -> int:
-        return self.document_processor.load_static_content()
+        with metrics.timed("static_load"):
+            return self.document_processor.load_static_content()
+    
+    def load_context_files(self, files, digests: Optional[Tuple[str, ...]] = None) -> int:
+        with metrics.timed("context_ingest"):
+            return self.document_processor.load_context_files(files, digests)
     
-    def load_context_files(self, files) -> int:
-        return self.document_processor.load_context_files(files)
+    def has_context_files(self, digests: Tuple[str, ...]) -> bool:
+        return self.document_processor.has_context_files(digests)
     
     def extract_job_info(self, job_url: str) -> str:
         return self.web_scraper.extract_job_info(job_url)
@@ -38,24 +49,80 @@ class CoverLetterGenerator:
         job_url: str = "", 
         additional_context: str = "",
         job_title: str = "",
-        company_name: str = ""
+        company_name: str = "",
+        fresh: bool = False
     ) -> str:
-        system_prompt = self._get_system_prompt()
-        context = self._get_context_from_documents(resume_text, job_description)
-        prompt = self._build_prompt(
-            system_prompt, context, resume_text, 
-            job_description, job_url, additional_context,
-            job_title, company_name
+        prompt = self._prepare_prompt(
+            resume_text, job_description, job_url,
+            additional_context, job_title, company_name
         )
-        
-        try:
-            response = self.llm.invoke([HumanMessage(content=prompt)])
-            return response.content
-        except Exception as e:
-            raise Exception(f"Error generating cover letter: {str(e)}")
+        return self._invoke(prompt, "Error generating cover letter", fresh)
+    
+    async def agenerate_cover_letter(
+        self, 
+        resume_text: str, 
+        job_description: str, 
+        job_url: str = "", 
+        additional_context: str = "",
+        job_title: str = "",
+        company_name: str = "",
+        fresh: bool = False
+    ) -> str:
+        """Async variant of generate_cover_letter for running many generations concurrently"""
+        # Context retrieval embeds the query synchronously, so keep it off the event loop
+        prompt = await asyncio.to_thread(
+            self._prepare_prompt,
+            resume_text, job_description, job_url,
+            additional_context, job_title, company_name
+        )
+        return await self._ainvoke(prompt, "Error generating cover letter", fresh)
+    
+    def stream_cover_letter(
+        self, 
+        resume_text: str, 
+        job_description: str, 
+        job_url: str = "", 
+        additional_context: str = "",
+        job_title: str = "",
+        company_name: str = "",
+        fresh: bool = False
+    ) -> Iterator[str]:
+        """Streaming variant of generate_cover_letter that yields text chunks as they arrive"""
+        prompt = self._prepare_prompt(
+            resume_text, job_description, job_url,
+            additional_context, job_title, company_name
+        )
+        yield from self._stream(prompt, "Error generating cover letter", fresh)
+    
+    def _prepare_prompt(
+        self, 
+        resume_text: str, 
+        job_description: str, 
+        job_url: str, 
+        additional_context: str,
+        job_title: str,
+        company_name: str
+    ) -> str:
+        system_prompt = self._get_system_prompt()
+        with metrics.timed("retrieval"):
+            context = self._get_context_from_documents(resume_text, job_description)
+        with metrics.timed("prompt_build"):
+            return self._build_prompt(
+                system_prompt, context, resume_text, 
+                job_description, job_url, additional_context,
+                job_title, company_name
+            )
     
     def create_pdf(self, cover_letter_text: str, filename: str = "cover_letter.pdf") -> bytes:
-        return self.pdf_generator.create_pdf(cover_letter_text, filename)
+        # Rendered once per distinct text and style; reruns and repeated downloads reuse the bytes
+        cache_key = self.pdf_generator.cache_key(cover_letter_text)
+        pdf_data = self.pdf_cache.get(cache_key)
+        metrics.count("cache_total", cache="pdf", result="miss" if pdf_data is None else "hit")
+        if pdf_data is None:
+            memory_governor.admit("pdf_render", self.document_processor)
+            pdf_data = self.pdf_generator.create_pdf(cover_letter_text, filename)
+            self.pdf_cache.set(cache_key, pdf_data)
+        return pdf_data
     
     def _get_system_prompt(self) -> str:
         return """You are an expert career counselor and cover letter specialist. Your task is to generate a professional, compelling cover letter following these 5 key rules:
@@ -71,7 +138,8 @@ The tone should be professional yet engaging, within one page (250-400 words). M
 IMPORTANT: Return ONLY plain text without any markdown formatting, HTML tags, or special characters. Do not use **bold**, *italics*, # headers, or any other markdown syntax."""
     
     def _get_context_from_documents(self, resume_text: str, job_description: str) -> str:
-        if not self.document_processor.vectorstore:
+        self.document_processor.retry_static_content()
+        if not self.document_processor.has_vectorstore:
             return ""
         
         query = f"resume: {resume_text[:500]} job: {job_description[:500]}"
@@ -94,40 +162,43 @@ IMPORTANT: Return ONLY plain text without any markdown formatting, HTML tags, or
         if not job_title:
             job_title = self._extract_job_title(job_description, job_url)
         
-        return f"""
-        {system_prompt}
-        
-        CONTEXT FROM EXAMPLES/INSTRUCTIONS:
-        {context}
-        
-        JOB INFORMATION:
-        Position: {job_title}
-        Company: {company_name}
-        Job Description: {job_description}
-        Job URL: {job_url}
-        
-        CANDIDATE BACKGROUND:
-        Resume: {resume_text}
-        Additional Context: {additional_context}
-        
-        Please generate a professional cover letter using this template structure:
-        
-        "I am applying for the {job_title} position at {company_name}. Here is the job description: {job_description}
-        
-        My background: [Extract years of experience and industry from resume]
-        Key skills: [List relevant skills from resume that match job requirements]
-        Major quantifiable achievements: [Extract 1-2 quantifiable accomplishments from resume]
-        Connection to the company: [Based on job description and company info, explain why interested]
-        
-        Write a concise, engaging, and professional cover letter following the 5 rules:
-        1. Strong self-introduction with an engaging hook
-        2. Highlight relevant experience & achievements
-        3. Connect my background to the company's mission & values
-        4. End with a confident & strong closing statement
-        5. Ensure formatting is clean, professional, and ATS-friendly
+        # Job description, resume and rules each appear once; the least important
+        # fields are trimmed first when the prompt runs over the token budget
+        assembler = PromptAssembler(Config.PROMPT_TOKEN_BUDGET)
+        assembler.add("system", system_prompt)
+        assembler.add(
+            "context", context,
+            header="CONTEXT FROM EXAMPLES/INSTRUCTIONS:",
+            truncate_order=0
+        )
+        assembler.add(
+            "job", f"Position: {job_title}\nCompany: {company_name}" + (f"\nJob URL: {job_url}" if job_url else ""),
+            header="JOB INFORMATION:"
+        )
+        assembler.add(
+            "job_description", job_description,
+            header="Job Description:",
+            truncate_order=2, min_tokens=300
+        )
+        assembler.add(
+            "resume", resume_text,
+            header="CANDIDATE BACKGROUND:\nResume:",
+            truncate_order=3, min_tokens=400
+        )
+        assembler.add(
+            "additional_context", additional_context,
+            header="Additional Context:",
+            truncate_order=1, min_tokens=50
+        )
+        assembler.add("instructions", f"""Write the cover letter for the {job_title} position at {company_name}, covering:
+My background: [Extract years of experience and industry from resume]
+Key skills: [List relevant skills from resume that match job requirements]
+Major quantifiable achievements: [Extract 1-2 quantifiable accomplishments from resume]
+Connection to the company: [Based on job description and company info, explain why interested]""")
         
-        The tone should be professional yet engaging, within one page (250-400 words)."
-        """
+        prompt = assembler.build()
+        self.last_prompt_stats = assembler.stats()
+        return prompt
     
     def _extract_company_name(self, job_description: str, job_url: str) -> str:
         """Extract company name from job description or URL"""
@@ -210,7 +281,7 @@ IMPORTANT: Return ONLY plain text without any markdown formatting, HTML tags, or
         
         return "[Job Title]"
     
-    def improve_cover_letter(self, existing_cover_letter: str) -> str:
+    def improve_cover_letter(self, existing_cover_letter: str, fresh: bool = False) -> str:
         """Improve an existing cover letter using the 5 rules"""
         system_prompt = """You are an expert career counselor and cover letter specialist. Your task is to improve an existing cover letter by ensuring it follows these 5 key rules:
 
@@ -240,19 +311,24 @@ IMPORTANT: Return ONLY plain text without any markdown formatting, HTML tags, or
         Rewrite it while keeping the unique experiences and voice, but making it more engaging and aligned with best practices.
         """
         
-        try:
-            response = self.llm.invoke([HumanMessage(content=prompt)])
-            return response.content
-        except Exception as e:
-            raise Exception(f"Error improving cover letter: {str(e)}")
+        return self._invoke(prompt, "Error improving cover letter", fresh)
     
-    def improve_cover_letter_with_prompt(self, cover_letter: str, custom_prompt: str) -> str:
+    def improve_cover_letter_with_prompt(self, cover_letter: str, custom_prompt: str, fresh: bool = False) -> str:
         """Improve an existing cover letter using a custom prompt"""
+        prompt = self._build_improvement_prompt(cover_letter, custom_prompt)
+        return self._invoke(prompt, "Error improving cover letter", fresh)
+    
+    def stream_improved_cover_letter_with_prompt(self, cover_letter: str, custom_prompt: str, fresh: bool = False) -> Iterator[str]:
+        """Streaming variant of improve_cover_letter_with_prompt that yields text chunks as they arrive"""
+        prompt = self._build_improvement_prompt(cover_letter, custom_prompt)
+        yield from self._stream(prompt, "Error improving cover letter", fresh)
+    
+    def _build_improvement_prompt(self, cover_letter: str, custom_prompt: str) -> str:
         system_prompt = """You are an expert career coach and cover letter writer. Your task is to improve existing cover letters based on specific instructions provided by the user.
 
 IMPORTANT: Return ONLY plain text without any markdown formatting, HTML tags, or special characters. Do not use **bold**, *italics*, # headers, or any other markdown syntax."""
         
-        prompt = f"""
+        return f"""
         {system_prompt}
         
         Here is the existing cover letter:
@@ -263,9 +339,75 @@ IMPORTANT: Return ONLY plain text without any markdown formatting, HTML tags, or
         
         Please rewrite the cover letter following the improvement instructions while maintaining the core message and personal experiences.
         """
+    
+    def cache_stats(self) -> dict:
+        """Hit/miss counters of the shared LLM response cache"""
+        return self.response_cache.stats() if self.response_cache else {}
+    
+    def _cache_key(self, prompt: str) -> str:
+        return self.response_cache.make_key(Config.GEMINI_MODEL, Config.GEMINI_TEMPERATURE, prompt)
+    
+    def _cached_response(self, prompt: str, fresh: bool):
+        # A fresh variant skips the lookup, but its result still replaces the cached one
+        if self.response_cache is None or fresh:
+            return None
+        cached = self.response_cache.get(self._cache_key(prompt))
+        metrics.count("cache_total", cache="response", result="miss" if cached is None else "hit")
+        return cached
+    
+    def _cache_response(self, prompt: str, response: str):
+        if self.response_cache is not None and response:
+            self.response_cache.set(self._cache_key(prompt), response)
+    
+    def _invoke(self, prompt: str, error_message: str, fresh: bool = False) -> str:
+        cached = self._cached_response(prompt, fresh)
+        if cached is not None:
+            return cached
         
+        memory_governor.admit("llm", self.document_processor)
         try:
-            response = self.llm.invoke([HumanMessage(content=prompt)])
-            return response.content
+            with metrics.timed("llm"):
+                response = self.llm.invoke([HumanMessage(content=prompt)])
         except Exception as e:
-            raise Exception(f"Error improving cover letter: {str(e)}")
+            raise Exception(f"{error_message}: {str(e)}")
+        
+        self._cache_response(prompt, response.content)
+        return response.content
+    
+    async def _ainvoke(self, prompt: str, error_message: str, fresh: bool = False) -> str:
+        cached = self._cached_response(prompt, fresh)
+        if cached is not None:
+            return cached
+        
+        memory_governor.admit("llm", self.document_processor)
+        try:
+            with metrics.timed("llm"):
+                response = await self.llm.ainvoke([HumanMessage(content=prompt)])
+        except Exception as e:
+            raise Exception(f"{error_message}: {str(e)}")
+        
+        self._cache_response(prompt, response.content)
+        return response.content
+    
+    def _stream(self, prompt: str, error_message: str, fresh: bool = False) -> Iterator[str]:
+        cached = self._cached_response(prompt, fresh)
+        if cached is not None:
+            yield cached
+            return
+        
+        memory_governor.admit("llm", self.document_processor)
+        chunks = []
+        started = time.perf_counter()
+        try:
+            with metrics.timed("llm"):
+                for chunk in self.llm.stream([HumanMessage(content=prompt)]):
+                    if chunk.content:
+                        if not chunks:
+                            metrics.record("llm_first_token", time.perf_counter() - started)
+                        chunks.append(chunk.content)
+                        yield chunk.content
+        except Exception as e:
+            raise Exception(f"{error_message}: {str(e)}")
+        
+        # Only a stream that ran to completion is worth caching
+        self._cache_response(prompt, "".join(chunks))
@@ -1,102 +1,210 @@
-import tempfile
-import os
-import glob
-from typing import List
-from langchain.document_loaders import PyPDFLoader, TextLoader
+import hashlib
+import threading
+import time
+from concurrent.futures import as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, Optional, Tuple
+from langchain.document_loaders import TextLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.vectorstores import FAISS
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from langchain.schema import Document
 
 from .config import Config
+from . import memory_governor, metrics, shared_resources
+from .context_ingestion import split_upload
+from .pdf_ingestion import cached_pdf_pages, load_pdf_documents, store_pdf_pages
+from .static_index import load_static_index, static_files
 
 class DocumentProcessor:
-    def __init__(self):
-        self.embeddings = GoogleGenerativeAIEmbeddings(
-            model="models/embedding-001",
-            google_api_key=Config.GOOGLE_API_KEY,
-            request_timeout=30
-        )
-        self.vectorstore = None
+    def __init__(self, embeddings=None):
+        # Shared per process and cached per chunk on disk, so only unseen chunks reach the embedding API
+        self.embeddings = embeddings or shared_resources.get_embeddings()
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=Config.CHUNK_SIZE,
             chunk_overlap=Config.CHUNK_OVERLAP
         )
-        self._static_documents = []
-        self._context_documents = []
-        self._static_vectorstore_created = False
-        self._context_vectorstore_created = False
+        # Two-layer index: the static layer is built once and never modified,
+        # the context layer follows the uploaded files incrementally
+        self.static_vectorstore = None
+        self.context_vectorstore = None
+        self._static_requested = False
+        self._static_loaded = False
+        self._num_static_documents = 0
+        # Uploaded file digest -> (number of documents, chunk ids in the context layer)
+        self._context_files: Dict[str, tuple] = {}
+        # The memory governor may drop the context layer of the least recently used sessions
+        self.last_used = time.monotonic()
+        self._context_lock = threading.Lock()
+        governor = memory_governor.get_memory_governor()
+        if governor is not None:
+            governor.register(self)
     
-    def load_static_content(self) -> int:
-        # Only load static content once
-        if self._static_documents:
-            return len(self._static_documents)
-            
-        documents = []
-        static_path = "static_content"
+    @property
+    def has_vectorstore(self) -> bool:
+        return self.static_vectorstore is not None or self.context_vectorstore is not None
+    
+    def has_context_files(self, digests: Tuple[str, ...]) -> bool:
+        """Whether every file in digests is loaded into the context layer"""
+        return bool(digests) and all(digest in self._context_files for digest in digests)
+    
+    def context_bytes(self) -> int:
+        """Approximate memory held by the context layer: float32 vectors plus chunk text"""
+        vectorstore = self.context_vectorstore
+        if vectorstore is None:
+            return 0
+        chunks = getattr(vectorstore.docstore, "_dict", {}).values()
+        return vectorstore.index.ntotal * vectorstore.index.d * 4 + sum(len(doc.page_content) for doc in chunks)
+    
+    def release_context(self) -> int:
+        """Drop the context layer to free memory and return its approximate size
         
-        if os.path.exists(static_path):
-            for file_path in glob.glob(f"{static_path}/**/*", recursive=True):
-                if os.path.isfile(file_path):
-                    if file_path.endswith('.pdf'):
-                        documents.extend(self._load_static_pdf(file_path))
-                    elif file_path.endswith('.txt'):
-                        documents.extend(self._load_static_text(file_path))
+        Skipped (returns 0) while this processor is loading files. The next load_context_files
+        call rebuilds the layer, mostly from the upload and embedding caches.
+        """
+        if not self._context_lock.acquire(blocking=False):
+            return 0
+        try:
+            released = self.context_bytes()
+            self.context_vectorstore = None
+            self._context_files = {}
+            return released
+        finally:
+            self._context_lock.release()
+    
+    def load_static_content(self) -> int:
+        # The static layer is shared by every processor in the process and only built once
+        self._static_requested = True
+        if not self._static_loaded:
+            self.static_vectorstore, self._num_static_documents = shared_resources.get_static_layer()
+            self._static_loaded = shared_resources.static_layer_ready()
+        return self._num_static_documents
+    
+    def retry_static_content(self):
+        # A failed static build isn't cached; pick up a later successful one (get_static_layer backs off)
+        if self._static_requested and not self._static_loaded:
+            self.load_static_content()
+    
+    def build_static_layer(self) -> Tuple[Optional[FAISS], int]:
+        # Prefer the prebuilt index artifact; it is skipped when the manifest is stale
+        if Config.ENABLE_VECTOR_SEARCH:
+            artifact = load_static_index(self.embeddings)
+            if artifact is not None:
+                return artifact
         
-        self._static_documents = documents
+        documents = self._load_static_documents()
+        vectorstore = None
         
-        if documents and Config.ENABLE_VECTOR_SEARCH and not self._static_vectorstore_created:
-            try:
-                self._create_vectorstore(documents)
-                self._static_vectorstore_created = True
-            except Exception as e:
-                print(f"Warning: Could not create vector store: {e}")
+        if documents and Config.ENABLE_VECTOR_SEARCH:
+            vectorstore = self._create_vectorstore(documents)
+            if vectorstore is None:
                 print("Static content loaded but vector search disabled")
-            
-        return len(documents)
+        
+        return vectorstore, len(documents)
+    
+    def _load_static_documents(self, static_path: str = Config.STATIC_CONTENT_DIR) -> List[Document]:
+        documents = []
+        for file_path in static_files(static_path):
+            if file_path.endswith('.pdf'):
+                documents.extend(self._load_static_pdf(file_path))
+            elif file_path.endswith('.txt'):
+                documents.extend(self._load_static_text(file_path))
+        return documents
+    
+    def load_context_files(self, files, digests: Optional[Tuple[str, ...]] = None) -> int:
+        """Sync the context layer with the uploaded files; digests, if known, skip re-hashing them"""
+        memory_governor.admit("context_ingest", self)
+        with self._context_lock:
+            self.last_used = time.monotonic()
+            return self._sync_context_files(files, digests)
     
-    def load_context_files(self, files) -> int:
-        # Create a hash of the files to check if they've changed
-        files_hash = hash(tuple(f.getvalue() for f in files))
+    def _sync_context_files(self, files, digests: Optional[Tuple[str, ...]]) -> int:
+        file_digests = dict(zip(digests, files)) if digests else {self._file_digest(f): f for f in files}
         
-        # Check if we already have these context files processed
-        if hasattr(self, '_context_files_hash') and self._context_files_hash == files_hash:
-            return len(self._context_documents)
+        # Drop the chunks of files that are no longer uploaded
+        removed = [digest for digest in self._context_files if digest not in file_digests]
+        for digest in removed:
+            _, chunk_ids = self._context_files.pop(digest)
+            if self.context_vectorstore is not None and chunk_ids:
+                self.context_vectorstore.delete(chunk_ids)
         
-        documents = []
+        if not self._context_files:
+            self.context_vectorstore = None
+        
+        # Only split and embed files that are new to the context layer, each as soon as it is split
+        new_files = {digest: f for digest, f in file_digests.items() if digest not in self._context_files}
+        for digest, num_documents, chunks in self._split_files(new_files):
+            chunk_ids = []
+            
+            if chunks and Config.ENABLE_VECTOR_SEARCH:
+                try:
+                    chunk_ids = self._add_to_context_layer(digest, chunks)
+                except Exception as e:
+                    # Not recorded, so the file is embedded again on the next sync
+                    print(f"Warning: Could not add {new_files[digest].name} to vector store: {e}")
+                    continue
+            
+            self._context_files[digest] = (num_documents, chunk_ids)
         
-        for uploaded_file in files:
-            if uploaded_file.type == "application/pdf":
-                documents.extend(self._load_pdf_file(uploaded_file))
-            elif uploaded_file.type == "text/plain":
-                documents.extend(self._load_text_file(uploaded_file))
+        return sum(num_docs for num_docs, _ in self._context_files.values())
+    
+    def _split_files(self, files: Dict[str, object]) -> Iterator[Tuple[str, int, List[Document]]]:
+        """Yield (digest, number of documents, chunks) per file in completion order
         
-        self._context_documents = documents
-        self._context_files_hash = files_hash
+        Several files are parsed and split in the shared process pool; a single file stays
+        in-process, where a large PDF still gets page-parallel extraction.
+        """
+        if len(files) < 2 or Config.INGESTION_WORKERS < 2:
+            for digest, uploaded_file in files.items():
+                documents = self._load_uploaded_file(uploaded_file, digest)
+                yield digest, len(documents), self.text_splitter.split_documents(documents)
+            return
         
-        # Combine with static documents for vector search
-        all_documents = self._static_documents + documents
+        pool = shared_resources.get_process_pool()
+        futures = {}
+        for digest, f in files.items():
+            # PDFs parsed before, by any session, only need splitting
+            pages = cached_pdf_pages(digest) if f.type == "application/pdf" else None
+            future = pool.submit(split_upload, f.getvalue(), f.name, f.type, Config.CHUNK_SIZE, Config.CHUNK_OVERLAP, pages)
+            futures[future] = digest
         
-        if all_documents and Config.ENABLE_VECTOR_SEARCH:
+        for future in as_completed(futures):
+            digest = futures[future]
             try:
-                self._create_vectorstore(all_documents)
+                num_documents, records, parsed_pages = future.result()
+                if parsed_pages is not None:
+                    store_pdf_pages(digest, parsed_pages)
             except Exception as e:
-                print(f"Warning: Could not create vector store: {e}")
-                print("Context files loaded but vector search disabled")
+                if isinstance(e, BrokenProcessPool):
+                    shared_resources.reset_process_pool()
+                print(f"Warning: Parallel ingestion of {files[digest].name} failed, loading it in-process: {e}")
+                documents = self._load_uploaded_file(files[digest], digest)
+                yield digest, len(documents), self.text_splitter.split_documents(documents)
+                continue
             
-        return len(documents)
+            yield digest, num_documents, [Document(page_content=text, metadata=metadata) for text, metadata in records]
     
-    def _load_pdf_file(self, uploaded_file) -> List[Document]:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            tmp_file.write(uploaded_file.getvalue())
-            tmp_file_path = tmp_file.name
-        
-        try:
-            loader = PyPDFLoader(tmp_file_path)
-            docs = loader.load()
-            return docs
-        finally:
-            os.unlink(tmp_file_path)
+    def _add_to_context_layer(self, digest: str, splits: List[Document]) -> List[str]:
+        chunk_ids = [f"{digest}-{i}" for i in range(len(splits))]
+        with metrics.timed("embed_chunks"):
+            if self.context_vectorstore is None:
+                self.context_vectorstore = FAISS.from_documents(splits, self.embeddings, ids=chunk_ids)
+            else:
+                self.context_vectorstore.add_documents(splits, ids=chunk_ids)
+        return chunk_ids
+    
+    @staticmethod
+    def _file_digest(uploaded_file) -> str:
+        return hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+    
+    def _load_uploaded_file(self, uploaded_file, digest: Optional[str] = None) -> List[Document]:
+        if uploaded_file.type == "application/pdf":
+            return self._load_pdf_file(uploaded_file, digest)
+        elif uploaded_file.type == "text/plain":
+            return self._load_text_file(uploaded_file)
+        return []
+    
+    def _load_pdf_file(self, uploaded_file, digest: Optional[str] = None) -> List[Document]:
+        return load_pdf_documents(uploaded_file.getvalue(), uploaded_file.name, digest)
     
     def _load_text_file(self, uploaded_file) -> List[Document]:
         content = uploaded_file.getvalue().decode("utf-8")
@@ -104,8 +212,8 @@ class DocumentProcessor:
     
     def _load_static_pdf(self, file_path) -> List[Document]:
         try:
-            loader = PyPDFLoader(file_path)
-            return loader.load()
+            with open(file_path, 'rb') as file:
+                return load_pdf_documents(file.read(), file_path)
         except Exception:
             return []
     
@@ -120,21 +228,33 @@ class DocumentProcessor:
     def _create_vectorstore(self, documents: List[Document]):
         try:
             splits = self.text_splitter.split_documents(documents)
-            self.vectorstore = FAISS.from_documents(splits, self.embeddings)
+            return FAISS.from_documents(splits, self.embeddings)
         except Exception as e:
             print(f"Warning: Failed to create vector store: {e}")
             print("Continuing without vector search capabilities...")
-            self.vectorstore = None
+            return None
     
     def search_similar_documents(self, query: str) -> str:
-        if not self.vectorstore:
+        self.last_used = time.monotonic()
+        layers = [vs for vs in (self.static_vectorstore, self.context_vectorstore) if vs is not None]
+        if not layers:
             return ""
         
         try:
-            relevant_docs = self.vectorstore.similarity_search(
-                query, 
-                k=Config.MAX_SIMILARITY_SEARCH_RESULTS
-            )
+            # Embed the query once and search every layer with the same vector
+            with metrics.timed("embed_query"):
+                query_vector = self.embeddings.embed_query(query)
+            scored_docs = []
+            with metrics.timed("similarity_search"):
+                for vectorstore in layers:
+                    scored_docs.extend(vectorstore.similarity_search_with_score_by_vector(
+                        query_vector,
+                        k=Config.MAX_SIMILARITY_SEARCH_RESULTS
+                    ))
+            
+            # FAISS returns L2 distances, so lower scores are closer matches
+            scored_docs.sort(key=lambda pair: pair[1])
+            relevant_docs = [doc for doc, _ in scored_docs[:Config.MAX_SIMILARITY_SEARCH_RESULTS]]
             
             if relevant_docs:
                 return "\n\n".join([doc.page_content for doc in relevant_docs])
@@ -0,0 +1,143 @@
+import atexit
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+class DriverPool:
+    """Bounded pool of warm headless browser drivers, leased for one extraction at a time
+    
+    Drivers are reset between leases, health-checked before reuse and replaced after
+    max_pages_per_driver pages or when they crash.
+    """
+    
+    def __init__(self, factory: Callable, max_size: int = 2, max_pages_per_driver: int = 20, lease_timeout: float = 30):
+        self.factory = factory
+        self.max_size = max_size
+        self.max_pages_per_driver = max_pages_per_driver
+        self.lease_timeout = lease_timeout
+        self._idle: List = []
+        self._pages: Dict[int, int] = {}
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        atexit.register(self.shutdown)
+    
+    @contextmanager
+    def lease(self):
+        driver = self._acquire()
+        healthy = True
+        try:
+            yield driver
+        except WebDriverException as e:
+            # A slow page is not a broken browser; anything else gets the driver recycled
+            healthy = isinstance(e, TimeoutException)
+            raise
+        finally:
+            self._release(driver, healthy)
+    
+    def prewarm(self, count: int = 1):
+        """Launch drivers in the background so the first lease doesn't pay the browser cold start"""
+        def warm():
+            for _ in range(count):
+                with self._condition:
+                    if self._closed or self._size >= self.max_size:
+                        return
+                    self._size += 1
+                try:
+                    driver = self.factory()
+                except Exception as e:
+                    print(f"Warning: Could not prewarm browser: {e}")
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    return
+                self._release(driver, True, used=False)
+        
+        threading.Thread(target=warm, daemon=True).start()
+    
+    def shutdown(self):
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for driver in idle:
+            self._quit(driver)
+    
+    def _acquire(self):
+        while True:
+            with self._condition:
+                if self._closed:
+                    raise Exception("Browser pool is shut down")
+                
+                if self._idle:
+                    driver = self._idle.pop()
+                elif self._size < self.max_size:
+                    self._size += 1
+                    driver = None
+                elif not self._condition.wait(self.lease_timeout):
+                    raise Exception("Timed out waiting for a free browser")
+                else:
+                    continue
+            
+            if driver is None:
+                try:
+                    return self.factory()
+                except Exception:
+                    self._discard(None)
+                    raise
+            
+            if self._is_healthy(driver):
+                return driver
+            self._discard(driver)
+    
+    def _release(self, driver, healthy: bool, used: bool = True):
+        key = id(driver)
+        with self._condition:
+            pages = self._pages.get(key, 0) + (1 if used else 0)
+            self._pages[key] = pages
+            recycle = self._closed or not healthy or pages >= self.max_pages_per_driver
+        
+        if not recycle:
+            recycle = not self._reset(driver)
+        
+        if recycle:
+            self._discard(driver)
+            return
+        
+        with self._condition:
+            self._idle.append(driver)
+            self._condition.notify()
+    
+    def _discard(self, driver):
+        if driver is not None:
+            self._quit(driver)
+        with self._condition:
+            if driver is not None:
+                self._pages.pop(id(driver), None)
+            self._size -= 1
+            self._condition.notify()
+    
+    @staticmethod
+    def _reset(driver) -> bool:
+        try:
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except Exception:
+            return False
+    
+    @staticmethod
+    def _is_healthy(driver) -> bool:
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+    
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
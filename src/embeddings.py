@@ -0,0 +1,109 @@
+import os
+from typing import List
+
+import numpy as np
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
+from langchain_core.embeddings import Embeddings
+
+from .config import Config
+
+# 32-bit FNV-1a, computed for every n-gram position of a batch at once
+FNV_OFFSET_BASIS = 2166136261
+FNV_PRIME = np.uint32(16777619)
+
+class HashedNgramEmbeddings(Embeddings):
+    """Local, CPU-only embeddings: hashed character n-gram counts, with no model files or network
+    
+    Each text's lowercased character n-grams are hashed into a fixed number of signed buckets
+    (the hashing trick), counts are log-scaled and rows L2-normalised, so FAISS's L2 distance
+    ranks like cosine similarity. A whole batch is hashed with vectorised NumPy operations.
+    """
+    
+    def __init__(
+        self,
+        dimensions: int = Config.LOCAL_EMBEDDING_DIMENSIONS,
+        ngram_range: tuple = Config.LOCAL_EMBEDDING_NGRAM_RANGE
+    ):
+        self.dimensions = dimensions
+        self.ngram_range = ngram_range
+    
+    @property
+    def model_id(self) -> str:
+        low, high = self.ngram_range
+        return f"local-hashed-ngram-{self.dimensions}-{low}-{high}"
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_array(texts).tolist()
+    
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_array([text])[0].tolist()
+    
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        """Embed a batch of texts into a (len(texts), dimensions) float32 array"""
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        
+        # All texts share one byte buffer, separated by NUL bytes; n-grams spanning a separator are dropped
+        encoded = [f" {' '.join(text.replace(chr(0), ' ').lower().split())} ".encode("utf-8") for text in texts]
+        buffer = np.frombuffer(b"\0".join(encoded) + b"\0", dtype=np.uint8)
+        starts = np.cumsum([0] + [len(e) + 1 for e in encoded[:-1]])
+        separators = buffer == 0
+        
+        hashes, positions = [], []
+        low, high = self.ngram_range
+        for n in range(low, high + 1):
+            count = len(buffer) - n + 1
+            if count <= 0:
+                continue
+            h = np.full(count, FNV_OFFSET_BASIS, dtype=np.uint32)
+            spans_separator = np.zeros(count, dtype=bool)
+            for k in range(n):
+                h = (h ^ buffer[k:k + count]) * FNV_PRIME
+                spans_separator |= separators[k:k + count]
+            keep = np.flatnonzero(~spans_separator)
+            hashes.append(h[keep])
+            positions.append(keep)
+        
+        vectors = np.zeros(len(texts) * self.dimensions)
+        if hashes:
+            hashes = np.concatenate(hashes)
+            rows = np.searchsorted(starts, np.concatenate(positions), side="right") - 1
+            # The top hash bit picks the sign, so colliding n-grams tend to cancel rather than pile up
+            signs = np.where(hashes >> 31, -1.0, 1.0)
+            buckets = rows * self.dimensions + (hashes % self.dimensions)
+            vectors = np.bincount(buckets, weights=signs, minlength=len(texts) * self.dimensions)
+        
+        vectors = vectors.reshape(len(texts), self.dimensions)
+        vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return (vectors / np.where(norms == 0, 1.0, norms)).astype(np.float32)
+
+def embedding_model_id(backend: str = Config.EMBEDDING_BACKEND) -> str:
+    """Identifies the vector space, so indexes built with another backend or model are never reused"""
+    if backend == "local":
+        return HashedNgramEmbeddings().model_id
+    return Config.EMBEDDING_MODEL
+
+def create_embeddings(backend: str = Config.EMBEDDING_BACKEND):
+    """Create the configured embeddings backend: the Gemini API (default) or local hashed n-grams"""
+    if backend == "local":
+        # Cheaper to recompute than to read back from the disk cache
+        return HashedNgramEmbeddings()
+    
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+    embeddings = GoogleGenerativeAIEmbeddings(
+        model=Config.EMBEDDING_MODEL,
+        google_api_key=Config.GOOGLE_API_KEY,
+        request_timeout=30
+    )
+    
+    if not Config.ENABLE_EMBEDDING_CACHE:
+        return embeddings
+    
+    # Keys are "<namespace><sha1 of chunk text>", so namespacing by model keeps
+    # vectors from different embedding models apart in the same store
+    os.makedirs(Config.EMBEDDING_CACHE_DIR, exist_ok=True)
+    store = LocalFileStore(Config.EMBEDDING_CACHE_DIR)
+    namespace = Config.EMBEDDING_MODEL.replace('/', '_') + '_'
+    return CacheBackedEmbeddings.from_bytes_store(embeddings, store, namespace=namespace)
@@ -0,0 +1,84 @@
+import threading
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from .config import Config
+
+REQUESTS = "requests"
+SELENIUM = "selenium"
+
+def domain_of(url: str) -> str:
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+class StrategyStats:
+    def __init__(self):
+        self.attempts = 0
+        self.successes = 0
+        self.latency = None  # Exponentially weighted average of successful attempts, in seconds
+    
+    def record(self, success: bool, latency: float):
+        self.attempts += 1
+        if success:
+            self.successes += 1
+            self.latency = latency if self.latency is None else 0.7 * self.latency + 0.3 * latency
+    
+    @property
+    def success_rate(self) -> float:
+        return self.successes / self.attempts if self.attempts else 0.0
+
+class ExtractionStats:
+    """Per-domain success rates and latencies of each extraction strategy, used to order and hedge them"""
+    
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, StrategyStats]] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, url: str, strategy: str, success: bool, latency: float):
+        with self._lock:
+            domain_stats = self._stats.setdefault(domain_of(url), {})
+            domain_stats.setdefault(strategy, StrategyStats()).record(success, latency)
+    
+    def get(self, url: str, strategy: str) -> Optional[StrategyStats]:
+        with self._lock:
+            return self._stats.get(domain_of(url), {}).get(strategy)
+    
+    def requests_is_futile(self, url: str) -> bool:
+        """True once requests has failed often enough on this domain to not be worth trying first"""
+        stats = self.get(url, REQUESTS)
+        return (
+            stats is not None
+            and stats.attempts >= Config.HEDGE_MIN_SAMPLES
+            and stats.success_rate < Config.HEDGE_SKIP_REQUESTS_BELOW
+        )
+    
+    def strategy_order(self, url: str) -> List[str]:
+        if self.requests_is_futile(url):
+            return [SELENIUM, REQUESTS]
+        return [REQUESTS, SELENIUM]
+    
+    def hedge_delay(self, url: str) -> float:
+        """How long to give requests before also starting the browser"""
+        stats = self.get(url, REQUESTS)
+        if stats is None or stats.attempts < Config.HEDGE_MIN_SAMPLES:
+            return Config.HEDGE_DELAY_SECONDS
+        if stats.latency is None:
+            return Config.HEDGE_MIN_DELAY_SECONDS
+        
+        # Give requests a bit longer than it usually needs, scaled down when it often fails
+        delay = stats.latency * 1.5 * max(stats.success_rate, 0.25)
+        return min(max(delay, Config.HEDGE_MIN_DELAY_SECONDS), Config.HEDGE_MAX_DELAY_SECONDS)
+    
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                domain: {
+                    strategy: {
+                        "attempts": stats.attempts,
+                        "success_rate": round(stats.success_rate, 3),
+                        "latency": round(stats.latency, 3) if stats.latency is not None else None
+                    }
+                    for strategy, stats in strategies.items()
+                }
+                for domain, strategies in self._stats.items()
+            }
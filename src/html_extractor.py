@@ -0,0 +1,225 @@
+"""
+Pluggable HTML job-content extraction backends driven by per-site selector tables
+"""
+import json
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .config import Config
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# (tag, attribute, value), most specific first. Like BeautifulSoup's find(tag, {attr: value}),
+# a class selector matches any one of an element's classes and an id selector matches exactly.
+SITE_SELECTORS: Dict[str, List[Tuple[str, Optional[str], Optional[str]]]] = {
+    'indeed.com': [
+        ('div', 'id', 'jobDescriptionText'),
+        ('div', 'class', 'jobsearch-jobDescriptionText'),
+        ('div', 'class', 'jobsearch-jobDescription'),
+    ],
+    'linkedin.com': [
+        ('div', 'class', 'description__text'),
+        ('div', 'class', 'jobs-description-content__text'),
+        ('div', 'class', 'jobs-box__html-content'),
+    ],
+    'glassdoor.com': [
+        ('div', 'class', 'jobDescriptionContent'),
+        ('div', 'class', 'jobDescription'),
+    ],
+}
+
+GENERIC_SELECTORS: List[Tuple[str, Optional[str], Optional[str]]] = [
+    ('div', 'class', 'job-description'),
+    ('div', 'class', 'description'),
+    ('div', 'class', 'job-details'),
+    ('div', 'class', 'job-content'),
+    ('main', None, None),
+    ('article', None, None),
+    ('div', 'class', 'content'),
+]
+
+# Page chrome that never belongs to a job description
+SKIPPED_TAGS = ("script", "style", "nav", "header", "footer")
+
+def site_selectors(url: str) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    host = (urlparse(url).hostname or "").lower()
+    for domain, selectors in SITE_SELECTORS.items():
+        if host == domain or host.endswith("." + domain):
+            return selectors
+    return []
+
+class SelectorTable:
+    """Selectors for one site compiled into a tag -> [(rank, attribute, value)] lookup"""
+    
+    def __init__(self, site: List[Tuple[str, Optional[str], Optional[str]]]):
+        self._by_tag: Dict[str, List[Tuple[int, Optional[str], Optional[str]]]] = {}
+        for rank, (tag, attribute, value) in enumerate(site + GENERIC_SELECTORS):
+            self._by_tag.setdefault(tag, []).append((rank, attribute, value))
+    
+    def rank(self, tag: str, attributes) -> Optional[int]:
+        """Best (lowest) rank of any selector matching the element, or None"""
+        for rank, attribute, value in self._by_tag.get(tag, ()):
+            if attribute is None:
+                return rank
+            actual = attributes.get(attribute)
+            if actual is None:
+                continue
+            if attribute == 'class' and value in actual.split():
+                return rank
+            if actual == value:
+                return rank
+        return None
+
+_selector_tables: Dict[str, SelectorTable] = {}
+
+def selector_table(url: str) -> SelectorTable:
+    site = site_selectors(url)
+    # Sites sharing a selector list share one compiled table
+    key = next((domain for domain, selectors in SITE_SELECTORS.items() if selectors is site), "")
+    if key not in _selector_tables:
+        _selector_tables[key] = SelectorTable(site)
+    return _selector_tables[key]
+
+class SoupExtractor:
+    """Reference backend: BeautifulSoup with the pure-Python html.parser"""
+    
+    name = "bs4"
+    
+    def extract(self, html: str, url: str) -> str:
+        from bs4 import BeautifulSoup
+        
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Remove script and style elements
+        for script in soup(list(SKIPPED_TAGS)):
+            script.decompose()
+        
+        job_content = None
+        for tag, attribute, value in site_selectors(url) + GENERIC_SELECTORS:
+            job_content = soup.find(tag, {attribute: value}) if attribute else soup.find(tag)
+            if job_content:
+                break
+        
+        return (job_content or soup).get_text()
+
+class LxmlExtractor:
+    """libxml2-backed backend that stops parsing once the top-priority selector's element closes
+    
+    Elements are ranked on their start tag, so for each selector the first element in
+    document order wins, as with BeautifulSoup's find(). A lower-priority match (say a
+    teaser above the full description) can still be beaten later in the page, so those
+    pages are parsed to the end. Elements inside SKIPPED_TAGS are never ranked, just as
+    the soup backend decomposes those tags before searching.
+    """
+    
+    name = "lxml"
+    CHUNK_SIZE = 64 * 1024
+    
+    def __init__(self):
+        skipped = " or ".join(f"ancestor::{tag}" for tag in SKIPPED_TAGS)
+        self._text_xpath = etree.XPath(f".//text()[not({skipped})]")
+    
+    def extract(self, html: str, url: str) -> str:
+        table = selector_table(url)
+        parser = etree.HTMLPullParser(events=('start', 'end'))
+        best_rank, best = None, None
+        finished = False
+        # Number of open SKIPPED_TAGS elements around the current position
+        skipped_depth = 0
+        
+        for offset in range(0, len(html), self.CHUNK_SIZE):
+            parser.feed(html[offset:offset + self.CHUNK_SIZE])
+            for event, element in parser.read_events():
+                if element.tag in SKIPPED_TAGS:
+                    skipped_depth += 1 if event == 'start' else -1
+                elif skipped_depth:
+                    continue
+                elif event == 'start':
+                    rank = table.rank(element.tag, element.attrib)
+                    if rank is not None and (best_rank is None or rank < best_rank):
+                        best_rank, best = rank, element
+                elif element is best and best_rank == 0:
+                    # The first element of the top-ranked selector is complete; nothing later can beat it
+                    finished = True
+                    break
+            if finished:
+                break
+        
+        if not finished:
+            root = parser.close()
+            if best is None:
+                # No selector matched: fall back to the whole page, like the soup backend
+                best = root
+        
+        return "".join(self._text_xpath(best)) if best is not None else ""
+
+def page_metadata(html: str, url: str) -> Dict[str, str]:
+    """Job title and company from JSON-LD JobPosting data, then Open Graph tags, then <title>"""
+    if LXML_AVAILABLE:
+        root = etree.HTML(html)
+        if root is None:
+            return {"title": "", "company": ""}
+        ld_blocks = root.xpath("//script[@type='application/ld+json']/text()")
+        meta = {
+            (element.get("property") or element.get("name") or "").lower(): element.get("content")
+            for element in root.xpath("//meta[@content]")
+        }
+        page_title = root.findtext(".//title") or ""
+    else:
+        from bs4 import BeautifulSoup
+        
+        soup = BeautifulSoup(html, 'html.parser')
+        ld_blocks = [script.string or "" for script in soup.find_all("script", type="application/ld+json")]
+        meta = {
+            (element.get("property") or element.get("name") or "").lower(): element["content"]
+            for element in soup.find_all("meta", content=True)
+        }
+        page_title = soup.title.get_text() if soup.title else ""
+    
+    posting = _job_posting(ld_blocks)
+    organization = posting.get("hiringOrganization") or {}
+    if isinstance(organization, dict):
+        organization = organization.get("name", "")
+    
+    title = posting.get("title") or meta.get("og:title") or page_title
+    company = organization or ""
+    # On job boards og:site_name names the board, not the employer
+    if not company and not site_selectors(url):
+        company = meta.get("og:site_name", "")
+    
+    return {"title": " ".join(str(title).split()), "company": " ".join(str(company).split())}
+
+def _job_posting(ld_blocks: List[str]) -> dict:
+    """First schema.org JobPosting object in a page's JSON-LD blocks, or {}"""
+    for block in ld_blocks:
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        
+        candidates = data if isinstance(data, list) else [data]
+        for candidate in list(candidates):
+            if isinstance(candidate, dict) and isinstance(candidate.get("@graph"), list):
+                candidates.extend(candidate["@graph"])
+        for candidate in candidates:
+            if isinstance(candidate, dict) and candidate.get("@type") == "JobPosting":
+                return candidate
+    return {}
+
+def get_extractor(backend: str = Config.HTML_EXTRACTOR_BACKEND):
+    """Return the configured extraction backend, falling back to BeautifulSoup when lxml is missing"""
+    if backend == "lxml" and LXML_AVAILABLE:
+        return _lxml_extractor()
+    return SoupExtractor()
+
+_lxml_instance = None
+
+def _lxml_extractor() -> "LxmlExtractor":
+    global _lxml_instance
+    if _lxml_instance is None:
+        _lxml_instance = LxmlExtractor()
+    return _lxml_instance
@@ -0,0 +1,151 @@
+"""
+Concurrent job-posting crawler writing one JSONL record per URL
+"""
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from .config import Config
+from .extraction_stats import REQUESTS, SELENIUM, domain_of
+from .html_extractor import page_metadata
+from .rate_limiter import HostRateLimiter
+from .web_scraper import WebScraper, extraction_stats, host_rate_limiter
+
+class JobCrawler:
+    """Fetches many job URLs concurrently, with a cap per domain and a browser fallback
+    
+    Pages come through the pooled HTTP session and the site selector tables. URLs where that
+    fails are retried in Selenium, at most browser_concurrency at a time since each holds a
+    pooled Chrome. Every URL yields a record with url, title, company, description, strategy
+    and latency; failures carry an error and a null strategy instead.
+    """
+    
+    def __init__(
+        self,
+        concurrency: int = Config.CRAWLER_CONCURRENCY,
+        per_domain: int = Config.CRAWLER_PER_DOMAIN_CONCURRENCY,
+        browser_concurrency: int = Config.SELENIUM_POOL_SIZE,
+        use_selenium: bool = True,
+        rate_limiter: Optional[HostRateLimiter] = None
+    ):
+        self.concurrency = concurrency
+        self.per_domain = per_domain
+        self.browser_concurrency = browser_concurrency
+        self.use_selenium = use_selenium
+        self.rate_limiter = rate_limiter or host_rate_limiter
+    
+    def run(self, urls: Iterable[str], output_path: Optional[str] = None) -> dict:
+        return asyncio.run(self.crawl(urls, output_path))
+    
+    async def crawl(self, urls: Iterable[str], output_path: Optional[str] = None) -> dict:
+        """Crawl every distinct URL, writing each record as soon as it finishes"""
+        urls = list(dict.fromkeys(url.strip() for url in urls if url.strip()))
+        semaphore = asyncio.Semaphore(self.concurrency)
+        domain_semaphores: Dict[str, asyncio.Semaphore] = {}
+        browser_semaphore = asyncio.Semaphore(self.browser_concurrency)
+        use_selenium = self.use_selenium and WebScraper._check_chrome_installed()
+        # Blocking fetches and parses run here rather than in the loop's small default executor
+        executor = ThreadPoolExecutor(max_workers=self.concurrency + self.browser_concurrency, thread_name_prefix="crawl")
+        loop = asyncio.get_running_loop()
+        
+        output = open(output_path, 'w', encoding='utf-8') if output_path else None
+        summary = {"succeeded": 0, "failed": 0, REQUESTS: 0, SELENIUM: 0}
+        started = time.perf_counter()
+        
+        async def process(url: str):
+            domain_semaphore = domain_semaphores.setdefault(domain_of(url), asyncio.Semaphore(self.per_domain))
+            async with semaphore, domain_semaphore:
+                record = await self._crawl_url(url, loop, executor, browser_semaphore, use_selenium)
+            
+            if record["strategy"]:
+                summary["succeeded"] += 1
+                summary[record["strategy"]] += 1
+            else:
+                summary["failed"] += 1
+            
+            if output:
+                output.write(json.dumps(record) + "\n")
+                output.flush()
+        
+        try:
+            await asyncio.gather(*(process(url) for url in urls))
+        finally:
+            executor.shutdown(wait=False)
+            if output:
+                output.close()
+        
+        summary["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        return summary
+    
+    async def _crawl_url(self, url: str, loop, executor, browser_semaphore: asyncio.Semaphore, use_selenium: bool) -> dict:
+        record = {"url": url, "title": "", "company": "", "description": "", "strategy": None}
+        started = time.perf_counter()
+        errors = []
+        
+        # Domains where requests keeps failing go straight to the browser
+        if not (use_selenium and extraction_stats.requests_is_futile(url)):
+            await self.rate_limiter.acquire_async(url)
+            fetch_started = time.perf_counter()
+            try:
+                html = await loop.run_in_executor(executor, WebScraper._fetch_html, url, False)
+                # Metadata usually survives in the <head> even when the body needs JavaScript
+                record.update(await loop.run_in_executor(executor, page_metadata, html, url))
+                record["description"] = await loop.run_in_executor(executor, WebScraper._description_from_html, html, url)
+                record["strategy"] = REQUESTS
+            except Exception as e:
+                errors.append(e)
+            # Time spent waiting on the rate limiter says nothing about the site
+            extraction_stats.record(url, REQUESTS, record["strategy"] is not None, time.perf_counter() - fetch_started)
+        
+        if record["strategy"] is None and use_selenium:
+            async with browser_semaphore:
+                await self.rate_limiter.acquire_async(url)
+                fetch_started = time.perf_counter()
+                try:
+                    text, html = await loop.run_in_executor(executor, WebScraper._scrape_with_selenium, url, None, False)
+                    metadata = await loop.run_in_executor(executor, page_metadata, html, url)
+                    # Keep anything the plain fetch already found in the <head>
+                    record.update({key: value for key, value in metadata.items() if value})
+                    record["description"] = text
+                    record["strategy"] = SELENIUM
+                except Exception as e:
+                    errors.append(e)
+                extraction_stats.record(url, SELENIUM, record["strategy"] is not None, time.perf_counter() - fetch_started)
+        
+        if record["strategy"] is None:
+            record["error"] = "; ".join(str(e) for e in errors) or "No extraction strategy available"
+        record["latency"] = round(time.perf_counter() - started, 3)
+        return record
+
+def load_urls(path: str) -> List[str]:
+    """One URL per line; blank lines and # comments are skipped"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crawl job posting URLs into a JSONL file")
+    parser.add_argument("input", help="Text file with one job URL per line")
+    parser.add_argument("--output", required=True, help="JSONL file to stream records to")
+    parser.add_argument("--concurrency", type=int, default=Config.CRAWLER_CONCURRENCY, help="Maximum URLs in flight")
+    parser.add_argument("--per-domain", type=int, default=Config.CRAWLER_PER_DOMAIN_CONCURRENCY, help="Maximum URLs in flight per domain")
+    parser.add_argument("--browsers", type=int, default=Config.SELENIUM_POOL_SIZE, help="Maximum concurrent Selenium fallbacks")
+    parser.add_argument("--no-selenium", action="store_true", help="Never fall back to the browser")
+    args = parser.parse_args(argv)
+    
+    crawler = JobCrawler(
+        concurrency=args.concurrency,
+        per_domain=args.per_domain,
+        browser_concurrency=args.browsers,
+        use_selenium=not args.no_selenium
+    )
+    summary = crawler.run(load_urls(args.input), args.output)
+    print(
+        f"✅ Crawled {summary['succeeded']} postings ({summary[REQUESTS]} via requests, "
+        f"{summary[SELENIUM]} via Selenium), {summary['failed']} failed in {summary['elapsed_seconds']}s"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Process memory budget: evicts caches under pressure and refuses heavy work past a hard limit
+
+Every DocumentProcessor registers itself here. Before heavy work (ingesting uploads, calling
+the LLM, rendering a PDF) callers ask admit(), which samples process RSS. Past the soft limit
+it frees memory in a fixed order until the estimate is back under it:
+
+1. context vectorstores of other sessions, least recently used first
+2. parsed uploads in the shared upload cache
+3. rendered PDF bytes in the PDF cache
+
+Past the hard limit the work is refused. Every decision is printed so the limits can be tuned.
+"""
+import ctypes
+import gc
+import threading
+import weakref
+from typing import Optional
+
+from . import metrics, shared_resources
+from .constants import ERROR_MEMORY_PRESSURE
+from .performance_config import PerformanceConfig
+
+MB = 1024 * 1024
+
+class MemoryPressureError(Exception):
+    """Heavy work refused because process memory is past the hard limit"""
+
+def _malloc_trim():
+    """Ask glibc to hand freed heap pages back to the OS, so RSS reflects the eviction"""
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+class MemoryGovernor:
+    def __init__(
+        self,
+        soft_limit_mb: float = PerformanceConfig.MEMORY_SOFT_LIMIT_MB,
+        hard_limit_mb: float = PerformanceConfig.MEMORY_HARD_LIMIT_MB
+    ):
+        self.soft_limit = int(soft_limit_mb * MB)
+        self.hard_limit = int(hard_limit_mb * MB)
+        self._processors = weakref.WeakSet()
+        self._lock = threading.Lock()
+    
+    def register(self, processor):
+        """Track a session's DocumentProcessor; it is forgotten when the session goes away"""
+        self._processors.add(processor)
+    
+    def usage(self) -> dict:
+        """Process RSS next to the sizes of the caches the governor can evict"""
+        rss = metrics.rss_bytes()
+        return {
+            "rss_mb": round(rss / MB, 1) if rss is not None else None,
+            "soft_limit_mb": round(self.soft_limit / MB, 1),
+            "hard_limit_mb": round(self.hard_limit / MB, 1),
+            "vectorstores_mb": round(sum(p.context_bytes() for p in list(self._processors)) / MB, 1),
+            "upload_cache_mb": round(shared_resources.get_upload_cache().stats()["bytes"] / MB, 1),
+            "pdf_cache_mb": round(shared_resources.get_pdf_cache().stats()["bytes"] / MB, 1)
+        }
+    
+    def admit(self, work: str, processor=None):
+        """Relieve memory pressure before heavy work and raise if the hard limit is still exceeded
+        
+        processor is the caller's own DocumentProcessor, whose vectorstore is evicted last.
+        """
+        rss = metrics.rss_bytes()
+        if rss is None or rss <= self.soft_limit:
+            return
+        
+        with self._lock:
+            # Another thread may have relieved the pressure while this one waited
+            rss = metrics.rss_bytes() or rss
+            if rss > self.soft_limit:
+                rss = self._relieve(rss, processor)
+        
+        if rss > self.hard_limit:
+            print(f"Memory governor: refusing {work} at {rss / MB:.0f} MB (hard limit {self.hard_limit / MB:.0f} MB)")
+            metrics.count("memory_refusals_total", work=work)
+            raise MemoryPressureError(ERROR_MEMORY_PRESSURE)
+    
+    def _relieve(self, rss: int, current=None) -> int:
+        """Evict in order until the estimated usage is under the soft limit; returns that estimate"""
+        excess = rss - self.soft_limit
+        freed = 0
+        print(f"Memory governor: {rss / MB:.0f} MB is over the soft limit of {self.soft_limit / MB:.0f} MB, evicting")
+        
+        idle = sorted((p for p in list(self._processors) if p is not current), key=lambda p: p.last_used)
+        for processor in idle + ([current] if current is not None else []):
+            if freed >= excess:
+                break
+            released = processor.release_context()
+            if released:
+                freed += released
+                self._log_eviction("vectorstore", released)
+        
+        for kind, cache in (("upload_cache", shared_resources.get_upload_cache()), ("pdf_cache", shared_resources.get_pdf_cache())):
+            if freed >= excess:
+                break
+            held = cache.stats()["bytes"]
+            released = cache.trim(max(0, held - (excess - freed)))
+            if released:
+                freed += released
+                self._log_eviction(kind, released)
+        
+        gc.collect()
+        _malloc_trim()
+        
+        # Freed memory is reused by later allocations even when the allocator keeps it
+        # mapped, so the estimate counts it as available although RSS may not drop
+        sampled = metrics.rss_bytes() or rss
+        estimate = min(sampled, rss - freed)
+        print(f"Memory governor: freed ~{freed / MB:.1f} MB, RSS now {sampled / MB:.0f} MB")
+        return estimate
+    
+    @staticmethod
+    def _log_eviction(kind: str, released: int):
+        print(f"Memory governor: evicted {released / MB:.1f} MB from {kind}")
+        metrics.count("memory_evictions_total", kind=kind)
+        metrics.count("memory_evicted_bytes_total", released, kind=kind)
+
+def get_memory_governor() -> Optional[MemoryGovernor]:
+    """The process-wide governor, or None when PerformanceConfig.ENABLE_MEMORY_GOVERNOR is off"""
+    if not PerformanceConfig.ENABLE_MEMORY_GOVERNOR:
+        return None
+    return shared_resources._get_or_create("memory_governor", MemoryGovernor)
+
+def admit(work: str, processor=None):
+    governor = get_memory_governor()
+    if governor is not None:
+        governor.admit(work, processor)
@@ -0,0 +1,237 @@
+"""
+Lightweight stage timers, counters and histograms with per-request traces
+
+Stages are timed with `with metrics.timed("stage"):`. Inside a `metrics.trace(...)` block every
+stage is also recorded on that request's trace, which the app's debug panel shows. Finished
+traces are appended to a JSON-lines file and the registry is rewritten as a Prometheus text
+file when PerformanceConfig.METRICS_JSONL_PATH / METRICS_PROMETHEUS_PATH are set. With
+PerformanceConfig.ENABLE_METRICS off, timed() and count() return immediately.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from .performance_config import PerformanceConfig
+
+ENABLED = PerformanceConfig.ENABLE_METRICS
+PREFIX = "cvinator_"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        # Per-bucket counts; the export makes them cumulative and adds +Inf from count
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+class MetricsRegistry:
+    """Process-wide counters, gauges and histograms, each keyed by name and label set"""
+    
+    def __init__(self):
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, name: str, value: float = 1.0, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+    
+    def set_gauge(self, name: str, value: float, **labels):
+        with self._lock:
+            self._gauges.setdefault(name, {})[tuple(sorted(labels.items()))] = value
+    
+    def observe(self, name: str, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(value)
+    
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+    
+    def snapshot(self) -> dict:
+        """Plain-dict view for JSON export and the debug panel"""
+        with self._lock:
+            return {
+                "counters": {name: [dict(key, value=value) for key, value in series.items()] for name, series in self._counters.items()},
+                "gauges": {name: [dict(key, value=value) for key, value in series.items()] for name, series in self._gauges.items()},
+                "histograms": {
+                    name: [dict(key, count=h.count, sum=round(h.sum, 6)) for key, h in series.items()]
+                    for name, series in self._histograms.items()
+                }
+            }
+    
+    def prometheus_text(self) -> str:
+        """Registry contents in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for kind, metrics in (("counter", self._counters), ("gauge", self._gauges)):
+                for name, series in sorted(metrics.items()):
+                    lines.append(f"# TYPE {PREFIX}{name} {kind}")
+                    for key, value in series.items():
+                        lines.append(f"{PREFIX}{name}{_format_labels(key)} {value:.17g}")
+            
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {PREFIX}{name} histogram")
+                for key, histogram in series.items():
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{PREFIX}{name}_bucket{_format_labels(key + (('le', f'{bound:g}'),))} {cumulative}")
+                    lines.append(f"{PREFIX}{name}_bucket{_format_labels(key + (('le', '+Inf'),))} {histogram.count}")
+                    lines.append(f"{PREFIX}{name}_sum{_format_labels(key)} {histogram.sum:.6f}")
+                    lines.append(f"{PREFIX}{name}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    pairs = ",".join(f'{label}="{_escape(str(value))}"' for label, value in key)
+    return "{" + pairs + "}"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+registry = MetricsRegistry()
+
+class Trace:
+    """Stage timings of one user-facing request, e.g. a single cover letter generation"""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = time.time()
+        self.seconds: Optional[float] = None
+        self.rss_mb: Optional[float] = None
+        self.stages: List[dict] = []
+    
+    def as_dict(self) -> dict:
+        return {
+            "request": self.name,
+            "started_at": round(self.started_at, 3),
+            "seconds": self.seconds,
+            "rss_mb": self.rss_mb,
+            "stages": self.stages
+        }
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("metrics_trace", default=None)
+recent_traces: deque = deque(maxlen=50)
+_NOOP = nullcontext()
+_export_lock = threading.Lock()
+
+def timed(stage: str):
+    """Context manager timing one stage; a shared no-op when metrics are disabled"""
+    if not ENABLED:
+        return _NOOP
+    return _timed(stage)
+
+@contextmanager
+def _timed(stage: str):
+    trace = _current_trace.get()
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except GeneratorExit:
+        # A stream the caller stopped reading early
+        outcome = "cancelled"
+        raise
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        record(stage, time.perf_counter() - started, outcome, trace)
+
+def record(stage: str, seconds: float, outcome: str = "ok", trace: Optional[Trace] = None):
+    """Record a stage measured elsewhere, such as the time to a stream's first token"""
+    if not ENABLED:
+        return
+    registry.observe("stage_seconds", seconds, stage=stage)
+    registry.inc("stage_total", stage=stage, outcome=outcome)
+    trace = trace or _current_trace.get()
+    if trace is not None:
+        trace.stages.append({"stage": stage, "seconds": round(seconds, 4), "outcome": outcome})
+
+def count(name: str, value: float = 1.0, **labels):
+    if ENABLED:
+        registry.inc(name, value, **labels)
+
+@contextmanager
+def trace(name: str):
+    """Collect every stage timed inside the block into one Trace, exported when the block ends"""
+    if not ENABLED:
+        yield None
+        return
+    
+    request_trace = Trace(name)
+    token = _current_trace.set(request_trace)
+    started = time.perf_counter()
+    try:
+        yield request_trace
+    finally:
+        _current_trace.reset(token)
+        request_trace.seconds = round(time.perf_counter() - started, 4)
+        registry.observe("request_seconds", request_trace.seconds, request=name)
+        
+        if PerformanceConfig.ENABLE_MEMORY_MONITORING:
+            rss = rss_bytes()
+            if rss is not None:
+                request_trace.rss_mb = round(rss / (1024 * 1024), 1)
+                registry.set_gauge("process_resident_memory_bytes", rss)
+        
+        recent_traces.append(request_trace)
+        _export(request_trace)
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size from /proc, or None where it isn't available"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+def _export(request_trace: Trace):
+    jsonl_path = PerformanceConfig.METRICS_JSONL_PATH
+    prometheus_path = PerformanceConfig.METRICS_PROMETHEUS_PATH
+    if not (jsonl_path or prometheus_path):
+        return
+    
+    try:
+        with _export_lock:
+            if jsonl_path:
+                with open(jsonl_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(request_trace.as_dict()) + "\n")
+            if prometheus_path:
+                # Replaced atomically so a scraper (e.g. node_exporter's textfile collector) never reads half a file
+                directory = os.path.dirname(os.path.abspath(prometheus_path))
+                fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(registry.prometheus_text())
+                os.replace(tmp_path, prometheus_path)
+    except OSError as e:
+        print(f"Warning: Could not export metrics: {e}")
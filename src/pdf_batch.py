@@ -0,0 +1,132 @@
+"""
+Batch cover letter PDF rendering across worker processes, to individual files or one streamed ZIP
+    
+    python -m src.pdf_batch letters.jsonl --zip letters.zip
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .config import Config
+from .pdf_generator import PDFGenerator
+
+# Set in each worker process by _init_worker, so stylesheets and paragraph styles are built once per worker
+_worker_generator: Optional[PDFGenerator] = None
+
+def _init_worker():
+    global _worker_generator
+    _worker_generator = PDFGenerator()
+
+def _render(item: Tuple[str, str]) -> Tuple[str, bytes]:
+    name, text = item
+    return name, _worker_generator.create_pdf(text)
+
+def pdf_filename(name: str, taken: Optional[Set[str]] = None) -> str:
+    """A safe, distinct file name for a letter id
+    
+    Ids that sanitizing changes get a short hash of the original, so "a b" and "a_b" don't
+    collide. With taken (the names used so far in one batch, updated here) a repeated name
+    gets a counter instead of overwriting an earlier file.
+    """
+    base = re.sub(r'[^A-Za-z0-9_.-]', '_', name)
+    if base != name:
+        base += "-" + hashlib.sha1(name.encode("utf-8")).hexdigest()[:8]
+    
+    filename = base + ".pdf"
+    if taken is not None:
+        counter = 1
+        while filename in taken:
+            counter += 1
+            filename = f"{base}-{counter}.pdf"
+        taken.add(filename)
+    return filename
+
+class BatchPDFRenderer:
+    """Renders many (name, cover letter text) pairs across a process pool
+    
+    Results come back in input order as (name, PDF bytes). With a single worker the letters
+    are rendered in-process, which avoids the pool's startup cost for small batches.
+    """
+    
+    def __init__(self, workers: int = Config.PDF_BATCH_WORKERS, chunksize: int = Config.PDF_BATCH_CHUNKSIZE):
+        self.workers = workers
+        self.chunksize = chunksize
+    
+    def render(self, letters: Iterable[Tuple[str, str]]) -> Iterator[Tuple[str, bytes]]:
+        if self.workers < 2:
+            generator = PDFGenerator()
+            for name, text in letters:
+                yield name, generator.create_pdf(text)
+            return
+        
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker
+        ) as pool:
+            # Letters go to workers in chunks, so per-task IPC overhead is paid once per chunk
+            yield from pool.map(_render, letters, chunksize=self.chunksize)
+    
+    def write_files(self, letters: Iterable[Tuple[str, str]], output_dir: str) -> List[str]:
+        """Write one PDF per letter into output_dir and return the paths"""
+        os.makedirs(output_dir, exist_ok=True)
+        paths = []
+        taken = set()
+        for name, pdf_data in self.render(letters):
+            path = os.path.join(output_dir, pdf_filename(name, taken))
+            with open(path, 'wb') as f:
+                f.write(pdf_data)
+            paths.append(path)
+        return paths
+    
+    def write_zip(self, letters: Iterable[Tuple[str, str]], output: Union[str, BinaryIO]) -> int:
+        """Stream every PDF into one ZIP as it is rendered and return the number of letters
+        
+        output may be a path or any writable binary file object, including unseekable
+        streams such as an HTTP response body.
+        """
+        count = 0
+        taken = set()
+        with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, pdf_data in self.render(letters):
+                archive.writestr(pdf_filename(name, taken), pdf_data)
+                count += 1
+        return count
+
+def load_letters(path: str) -> List[Tuple[str, str]]:
+    """(id, cover_letter) pairs from a bulk generation JSONL file, skipping failed records"""
+    letters = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for index, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get("cover_letter"):
+                letters.append((str(record.get("id", index)), record["cover_letter"]))
+    return letters
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render cover letters from a JSONL file to PDFs")
+    parser.add_argument("input", help="JSONL file with id and cover_letter fields, e.g. bulk generator output")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("--output-dir", help="Directory to write one PDF per letter to")
+    output.add_argument("--zip", help="ZIP file to stream every PDF into")
+    parser.add_argument("--workers", type=int, default=Config.PDF_BATCH_WORKERS, help="Rendering processes")
+    args = parser.parse_args(argv)
+    
+    renderer = BatchPDFRenderer(workers=args.workers)
+    letters = load_letters(args.input)
+    if args.zip:
+        count = renderer.write_zip(letters, args.zip)
+    else:
+        count = len(renderer.write_files(letters, args.output_dir))
+    print(f"✅ Rendered {count} cover letters")
+
+if __name__ == "__main__":
+    main()
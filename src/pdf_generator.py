@@ -1,3 +1,4 @@
+import hashlib
 import io
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
@@ -5,6 +6,7 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 
 from .config import Config
+from . import metrics
 
 class PDFGenerator:
     def __init__(self):
@@ -29,6 +31,11 @@ class PDFGenerator:
             rightIndent=0
         )
     
+    def cache_key(self, cover_letter_text: str) -> str:
+        """Identifies the rendered output: the letter text plus every style setting that affects it"""
+        style = (letter, Config.PDF_TITLE_FONT_SIZE, Config.PDF_BODY_FONT_SIZE, Config.PDF_SPACING)
+        return hashlib.sha256(f"{style}\x1f{cover_letter_text}".encode("utf-8")).hexdigest()
+    
     def create_pdf(self, cover_letter_text: str, filename: str = "cover_letter.pdf") -> bytes:
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter)
@@ -44,7 +51,8 @@ class PDFGenerator:
                 story.append(Paragraph(para.strip(), self.body_style))
                 story.append(Spacer(1, Config.PDF_SPACING))
         
-        doc.build(story)
+        with metrics.timed("pdf_render"):
+            doc.build(story)
         buffer.seek(0)
         
         return buffer.getvalue()
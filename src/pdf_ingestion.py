@@ -0,0 +1,82 @@
+"""
+PDF text extraction straight from uploaded bytes, memoized by content digest
+"""
+import hashlib
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import List, Optional
+
+from pypdf import PdfReader
+
+from .config import Config
+from . import metrics, shared_resources
+
+def pdf_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def extract_pdf_pages(data: bytes, digest: Optional[str] = None) -> List[str]:
+    """Text of every page, parsed once per distinct file across all sessions"""
+    digest = digest or pdf_digest(data)
+    pages = cached_pdf_pages(digest)
+    if pages is None:
+        with metrics.timed("pdf_parse"):
+            pages = _extract_pages(data)
+        store_pdf_pages(digest, pages)
+    return pages
+
+def cached_pdf_pages(digest: str) -> Optional[List[str]]:
+    """Page texts of a file already parsed in this process, or None"""
+    pages = shared_resources.get_upload_cache().get("pdf:" + digest)
+    metrics.count("cache_total", cache="pdf_text", result="miss" if pages is None else "hit")
+    return pages
+
+def store_pdf_pages(digest: str, pages: List[str]):
+    """Memoize page texts parsed elsewhere, e.g. in an ingestion worker process"""
+    shared_resources.get_upload_cache().set("pdf:" + digest, pages)
+
+def extract_pdf_text(data: bytes, digest: Optional[str] = None) -> str:
+    return "\n".join(extract_pdf_pages(data, digest))
+
+def load_pdf_documents(data: bytes, source: str = "", digest: Optional[str] = None) -> list:
+    """One Document per page, with the same metadata PyPDFLoader produces"""
+    # Imported here so spawned extraction workers, which import this module, skip langchain
+    from langchain.schema import Document
+    
+    return [
+        Document(page_content=text, metadata={"source": source, "page": page_number})
+        for page_number, text in enumerate(extract_pdf_pages(data, digest))
+    ]
+
+def read_pdf_pages(data: bytes) -> List[str]:
+    """Page texts extracted in the calling process, bypassing the cache and the worker pool
+    
+    Only for ingestion workers, whose results the parent stores with store_pdf_pages.
+    """
+    return [page.extract_text() for page in PdfReader(BytesIO(data)).pages]
+
+def _extract_pages(data: bytes) -> List[str]:
+    reader = PdfReader(BytesIO(data))
+    num_pages = len(reader.pages)
+    workers = Config.INGESTION_WORKERS
+    
+    if num_pages < Config.PDF_PARALLEL_MIN_PAGES or workers < 2:
+        return [page.extract_text() for page in reader.pages]
+    
+    # One contiguous page range per worker; each worker parses its own reader from the bytes
+    step = -(-num_pages // workers)
+    ranges = [(start, min(start + step, num_pages)) for start in range(0, num_pages, step)]
+    try:
+        pool = shared_resources.get_process_pool()
+        futures = [pool.submit(_extract_page_range, data, start, end) for start, end in ranges]
+        return [text for future in futures for text in future.result()]
+    except BrokenProcessPool as e:
+        print(f"Warning: PDF worker process died, extracting serially: {e}")
+        shared_resources.reset_process_pool()
+        return [page.extract_text() for page in reader.pages]
+    except Exception as e:
+        print(f"Warning: Parallel PDF extraction failed, extracting serially: {e}")
+        return [page.extract_text() for page in reader.pages]
+
+def _extract_page_range(data: bytes, start: int, end: int) -> List[str]:
+    reader = PdfReader(BytesIO(data))
+    return [reader.pages[i].extract_text() for i in range(start, end)]
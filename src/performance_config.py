@@ -12,8 +12,17 @@ class PerformanceConfig:
     STREAMLIT_SERVER_ENABLE_XSRF_PROTECTION = False
     
     # Memory optimizations
-    MAX_MEMORY_USAGE_MB = 512
+    MAX_MEMORY_USAGE_MB = int(os.getenv("MAX_MEMORY_USAGE_MB", "512"))
     ENABLE_MEMORY_MONITORING = True
+    # Memory governor (src/memory_governor.py): evict caches past the soft limit, refuse heavy work past the hard one
+    ENABLE_MEMORY_GOVERNOR = os.getenv("ENABLE_MEMORY_GOVERNOR", "true").lower() == "true"
+    MEMORY_SOFT_LIMIT_MB = float(os.getenv("MEMORY_SOFT_LIMIT_MB", MAX_MEMORY_USAGE_MB * 0.75))
+    MEMORY_HARD_LIMIT_MB = float(os.getenv("MEMORY_HARD_LIMIT_MB", MAX_MEMORY_USAGE_MB * 0.9))
+    # Stage timers and counters (src/metrics.py); sinks are off unless a path is set
+    ENABLE_METRICS = os.getenv("ENABLE_METRICS", "true").lower() == "true"
+    METRICS_JSONL_PATH = os.getenv("METRICS_JSONL_PATH")
+    METRICS_PROMETHEUS_PATH = os.getenv("METRICS_PROMETHEUS_PATH")
+    UPLOAD_CACHE_MEMORY_FRACTION = 0.1  # Share of MAX_MEMORY_USAGE_MB kept for parsed uploads
     
     # Caching configurations
     ENABLE_STREAMLIT_CACHING = True
@@ -0,0 +1,89 @@
+import math
+from typing import Dict, List, Optional
+
+# Gemini tokenizes English prose at roughly four characters per token. Counting locally
+# keeps prompt assembly free of the extra round-trip a count_tokens API call would cost.
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to about max_tokens, on a word boundary, marking the cut"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+    
+    limit = max_tokens * CHARS_PER_TOKEN - len(" ...")
+    cut = text[:limit]
+    last_space = cut.rfind(" ")
+    if last_space > limit // 2:
+        cut = cut[:last_space]
+    return cut.rstrip() + " ..."
+
+class PromptSection:
+    def __init__(self, name: str, text: str, header: str = "", truncate_order: Optional[int] = None, min_tokens: int = 0):
+        self.name = name
+        self.text = text
+        self.header = header
+        # Sections with a lower truncate_order are cut first; None means the section is never cut
+        self.truncate_order = truncate_order
+        self.min_tokens = min_tokens
+    
+    def render(self) -> str:
+        return f"{self.header}\n{self.text}" if self.header else self.text
+    
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.render()) if self.text else 0
+
+class PromptAssembler:
+    """Builds a prompt from named sections, trimming the least important ones to fit a token budget"""
+    
+    def __init__(self, token_budget: int):
+        self.token_budget = token_budget
+        self.sections: List[PromptSection] = []
+        self.truncated: List[str] = []
+    
+    def add(self, name: str, text: str, header: str = "", truncate_order: Optional[int] = None, min_tokens: int = 0):
+        text = (text or "").strip()
+        # Empty optional sections are dropped along with their header
+        if text or truncate_order is None:
+            self.sections.append(PromptSection(name, text, header, truncate_order, min_tokens))
+        return self
+    
+    def build(self) -> str:
+        self.truncated = []
+        overflow = sum(section.tokens for section in self.sections) - self.token_budget
+        
+        trimmable = sorted(
+            (section for section in self.sections if section.truncate_order is not None),
+            key=lambda section: section.truncate_order
+        )
+        for section in trimmable:
+            if overflow <= 0:
+                break
+            text_tokens = estimate_tokens(section.text)
+            keep = max(section.min_tokens, text_tokens - overflow)
+            if keep >= text_tokens:
+                continue
+            
+            before = section.tokens
+            section.text = truncate_to_tokens(section.text, keep)
+            overflow -= before - section.tokens
+            self.truncated.append(section.name)
+        
+        return "\n\n".join(section.render() for section in self.sections if section.text)
+    
+    def token_counts(self) -> Dict[str, int]:
+        return {section.name: section.tokens for section in self.sections}
+    
+    def stats(self) -> dict:
+        counts = self.token_counts()
+        return {
+            "sections": counts,
+            "total_tokens": sum(counts.values()),
+            "budget": self.token_budget,
+            "truncated": list(self.truncated)
+        }
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Tuple
+from urllib.parse import urlparse
+
+class TokenBucket:
+    """Token bucket that refills at `rate` tokens per second and holds at most `capacity` tokens"""
+    
+    def __init__(self, rate: float, capacity: float = 1):
+        if rate <= 0:
+            raise ValueError(f"Token bucket rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def per_minute(cls, requests_per_minute: float, burst: float = 1) -> "TokenBucket":
+        return cls(requests_per_minute / 60.0, burst)
+    
+    def _reserve(self) -> float:
+        """Take a token and return how long the caller has to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Going negative reserves a future token, so waiters queue up in order
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+    
+    def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+    
+    async def acquire_async(self):
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+class HostRateLimiter:
+    """One token bucket per domain, so a burst against one site never delays another
+    
+    limits maps a domain to (requests per second, burst size). A host matches a domain
+    when it equals it or is a subdomain of it; unmatched hosts each get their own bucket
+    with the "default" limits.
+    """
+    
+    def __init__(self, limits: Dict[str, Tuple[float, float]]):
+        self.limits = dict(limits)
+        self.default = self.limits.pop("default", (1.0, 1))
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+    
+    def bucket_for(self, url: str) -> TokenBucket:
+        host = (urlparse(url).hostname or "").lower()
+        key, limits = host, self.default
+        for domain, domain_limits in self.limits.items():
+            if host == domain or host.endswith("." + domain):
+                key, limits = domain, domain_limits
+                break
+        
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                rate, burst = limits
+                bucket = self._buckets[key] = TokenBucket(rate, burst)
+            return bucket
+    
+    def acquire(self, url: str):
+        self.bucket_for(url).acquire()
+    
+    async def acquire_async(self, url: str):
+        await self.bucket_for(url).acquire_async()
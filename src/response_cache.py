@@ -0,0 +1,196 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+class ResponseCache:
+    """Exact-match cache with TTL: an in-memory LRU tier in front of an optional on-disk tier
+    
+    Values must be JSON-serializable. The disk tier stores one file per key and evicts the
+    least recently used files once it grows past max_disk_mb.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl_seconds: float = 3600,
+        cache_dir: Optional[str] = None,
+        max_disk_mb: float = 50
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = int(max_disk_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = 0
+        
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, _, size in self._disk_entries())
+    
+    @staticmethod
+    def make_key(*parts) -> str:
+        return hashlib.sha256("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+        
+        entry = self._read_disk(key, now)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            # Promote disk hits so the next lookup is served from memory
+            self._store_memory(key, entry)
+            self.hits += 1
+            return entry[1]
+    
+    def set(self, key: str, value: Any):
+        entry = (time.time() + self.ttl_seconds, value)
+        with self._lock:
+            self._store_memory(key, entry)
+        self._write_disk(key, entry)
+    
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_bytes": self._disk_bytes
+            }
+    
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        for path, _, _ in self._disk_entries():
+            self._remove(path)
+    
+    def _store_memory(self, key: str, entry: tuple):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+    
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+    
+    def _read_disk(self, key: str, now: float) -> Optional[tuple]:
+        if not self.cache_dir:
+            return None
+        
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except OSError:
+            return None
+        except ValueError:
+            record = None
+        
+        # Truncated or foreign files are misses and are removed, like expired entries
+        malformed = not (
+            isinstance(record, dict)
+            and isinstance(record.get("expires_at"), (int, float))
+            and "value" in record
+        )
+        if malformed or record["expires_at"] <= now:
+            self._discard(path)
+            return None
+        
+        # Touch the file so disk eviction follows recency of use
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return record["expires_at"], record["value"]
+    
+    def _discard(self, path: str):
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        if self._remove(path):
+            with self._lock:
+                self._disk_bytes -= size
+    
+    def _write_disk(self, key: str, entry: tuple):
+        if not self.cache_dir:
+            return
+        
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+            # Write to a temp file and rename, so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"expires_at": entry[0], "value": entry[1]}, f)
+            os.replace(tmp_path, path)
+            
+            with self._lock:
+                self._disk_bytes += os.path.getsize(path) - previous_size
+                over_budget = self._disk_bytes > self.max_disk_bytes
+            if over_budget:
+                self._evict_disk()
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Warning: Could not write response cache entry: {e}")
+    
+    def _evict_disk(self):
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        target = self.max_disk_bytes * 0.9
+        
+        for path, mtime, size in entries:
+            if total <= target:
+                break
+            self._remove(path)
+            total -= size
+        
+        with self._lock:
+            self._disk_bytes = total
+    
+    def _disk_entries(self):
+        """Yield (path, mtime, size) for every entry in the disk tier"""
+        if not self.cache_dir or not os.path.exists(self.cache_dir):
+            return
+        for shard in os.listdir(self.cache_dir):
+            shard_path = os.path.join(self.cache_dir, shard)
+            if not os.path.isdir(shard_path):
+                continue
+            for name in os.listdir(shard_path):
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(shard_path, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_mtime, stat.st_size
+    
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.unlink(path)
+            return True
+        except OSError:
+            return False
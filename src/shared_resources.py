@@ -0,0 +1,172 @@
+"""
+Process-wide, read-only resources shared by every Streamlit session
+"""
+import threading
+import time
+from typing import Callable, Dict
+
+from .config import Config
+
+_resources: Dict[str, object] = {}
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+# (monotonic time, number of static documents) of the last static layer build that failed
+_static_layer_failure = None
+
+def _get_or_create(name: str, factory: Callable):
+    """Create a resource once per process; concurrent callers wait for the first build"""
+    resource = _resources.get(name)
+    if resource is not None:
+        return resource
+    
+    with _locks_guard:
+        lock = _locks.setdefault(name, threading.Lock())
+    
+    with lock:
+        if name not in _resources:
+            _resources[name] = factory()
+        return _resources[name]
+
+def get_llm():
+    def factory():
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        return ChatGoogleGenerativeAI(
+            model=Config.GEMINI_MODEL,
+            temperature=Config.GEMINI_TEMPERATURE,
+            google_api_key=Config.GOOGLE_API_KEY
+        )
+    return _get_or_create("llm", factory)
+
+def get_embeddings():
+    def factory():
+        from .embeddings import create_embeddings
+        return create_embeddings()
+    return _get_or_create("embeddings", factory)
+
+def get_pdf_generator():
+    def factory():
+        from .pdf_generator import PDFGenerator
+        return PDFGenerator()
+    return _get_or_create("pdf_generator", factory)
+
+def get_response_cache():
+    def factory():
+        from .performance_config import PerformanceConfig
+        from .response_cache import ResponseCache
+        return ResponseCache(
+            max_entries=Config.RESPONSE_CACHE_MAX_ENTRIES,
+            ttl_seconds=PerformanceConfig.CACHE_TTL_SECONDS,
+            cache_dir=Config.RESPONSE_CACHE_DIR,
+            max_disk_mb=Config.RESPONSE_CACHE_MAX_DISK_MB
+        )
+    return _get_or_create("response_cache", factory)
+
+def get_http_cache():
+    """Raw page bodies with their ETag/Last-Modified validators, kept on disk for conditional GETs"""
+    def factory():
+        from .response_cache import ResponseCache
+        return ResponseCache(
+            max_entries=32,
+            ttl_seconds=Config.HTTP_CACHE_TTL_SECONDS,
+            cache_dir=Config.HTTP_CACHE_DIR,
+            max_disk_mb=100
+        )
+    return _get_or_create("http_cache", factory)
+
+def get_extraction_cache():
+    """Cleaned job descriptions per URL"""
+    def factory():
+        from .response_cache import ResponseCache
+        return ResponseCache(
+            max_entries=256,
+            ttl_seconds=Config.JOB_EXTRACTION_CACHE_TTL_SECONDS
+        )
+    return _get_or_create("extraction_cache", factory)
+
+def get_upload_cache():
+    """Parsed uploads keyed by content digest, shared by every page and session"""
+    def factory():
+        from .performance_config import PerformanceConfig
+        from .upload_cache import UploadCache
+        max_mb = PerformanceConfig.MAX_MEMORY_USAGE_MB * PerformanceConfig.UPLOAD_CACHE_MEMORY_FRACTION
+        return UploadCache(max_bytes=int(max_mb * 1024 * 1024))
+    return _get_or_create("upload_cache", factory)
+
+def get_pdf_cache():
+    """Rendered PDF bytes per letter text and style, filled only when a download is requested"""
+    def factory():
+        from .upload_cache import UploadCache
+        return UploadCache(max_bytes=int(Config.PDF_CACHE_MAX_MB * 1024 * 1024))
+    return _get_or_create("pdf_cache", factory)
+
+def get_process_pool():
+    """Worker processes for CPU-bound document parsing, started on first use"""
+    def factory():
+        import atexit
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        # Forking a process that already runs Streamlit's threads is unsafe, so workers are spawned
+        pool = ProcessPoolExecutor(
+            max_workers=Config.INGESTION_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        atexit.register(pool.shutdown, wait=False, cancel_futures=True)
+        return pool
+    return _get_or_create("process_pool", factory)
+
+def reset_process_pool():
+    """Drop a broken pool (a worker died) so the next get_process_pool() starts a fresh one"""
+    with _locks_guard:
+        pool = _resources.pop("process_pool", None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def get_driver_pool():
+    """Warm headless Chrome drivers for the Selenium extraction fallback"""
+    def factory():
+        from .driver_pool import DriverPool
+        from .web_scraper import WebScraper
+        pool = DriverPool(
+            WebScraper._setup_selenium_driver,
+            max_size=Config.SELENIUM_POOL_SIZE,
+            max_pages_per_driver=Config.SELENIUM_MAX_PAGES_PER_DRIVER,
+            lease_timeout=Config.SELENIUM_LEASE_TIMEOUT
+        )
+        if Config.SELENIUM_PREWARM_DRIVERS and WebScraper._check_chrome_installed():
+            pool.prewarm(Config.SELENIUM_PREWARM_DRIVERS)
+        return pool
+    return _get_or_create("driver_pool", factory)
+
+def get_static_layer():
+    """Return (static vectorstore or None, number of static documents), built once per process
+    
+    A build whose vectorstore failed, e.g. during an embedding API outage, is not cached;
+    it is retried by the first call after Config.STATIC_LAYER_RETRY_SECONDS.
+    """
+    global _static_layer_failure
+    layer = _resources.get("static_layer")
+    if layer is not None:
+        return layer
+    
+    with _locks_guard:
+        lock = _locks.setdefault("static_layer", threading.Lock())
+    
+    with lock:
+        if "static_layer" in _resources:
+            return _resources["static_layer"]
+        if _static_layer_failure and time.monotonic() - _static_layer_failure[0] < Config.STATIC_LAYER_RETRY_SECONDS:
+            return None, _static_layer_failure[1]
+        
+        from .document_processor import DocumentProcessor
+        vectorstore, num_documents = DocumentProcessor().build_static_layer()
+        if vectorstore is None and num_documents and Config.ENABLE_VECTOR_SEARCH:
+            _static_layer_failure = (time.monotonic(), num_documents)
+            return vectorstore, num_documents
+        
+        _static_layer_failure = None
+        _resources["static_layer"] = (vectorstore, num_documents)
+        return _resources["static_layer"]
+
+def static_layer_ready() -> bool:
+    """Whether the static layer has been built successfully (or legitimately has no vectorstore)"""
+    return "static_layer" in _resources
@@ -0,0 +1,143 @@
+"""
+Build-time FAISS index for static_content/, loaded at runtime via memory mapping
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+from typing import List, Optional, Tuple
+
+import faiss
+from langchain.docstore.in_memory import InMemoryDocstore
+from langchain.vectorstores import FAISS
+from langchain.schema import Document
+
+from .config import Config
+from .embeddings import embedding_model_id
+
+INDEX_FILE = "index.faiss"
+CHUNKS_FILE = "chunks.jsonl"
+MANIFEST_FILE = "manifest.json"
+
+def static_files(static_path: str = Config.STATIC_CONTENT_DIR) -> List[str]:
+    """List the static content files that feed the index, in a stable order"""
+    if not os.path.exists(static_path):
+        return []
+    return sorted(
+        file_path for file_path in glob.glob(f"{static_path}/**/*", recursive=True)
+        if os.path.isfile(file_path) and file_path.endswith(('.pdf', '.txt'))
+    )
+
+def build_manifest(static_path: str = Config.STATIC_CONTENT_DIR) -> dict:
+    """Describe the inputs an index was built from, so stale artifacts can be detected"""
+    files = {}
+    for file_path in static_files(static_path):
+        with open(file_path, 'rb') as f:
+            files[os.path.relpath(file_path, static_path)] = hashlib.sha256(f.read()).hexdigest()
+    
+    return {
+        "embedding_model": embedding_model_id(),
+        "chunk_size": Config.CHUNK_SIZE,
+        "chunk_overlap": Config.CHUNK_OVERLAP,
+        "files": files
+    }
+
+def build_static_index(
+    static_path: str = Config.STATIC_CONTENT_DIR,
+    output_dir: str = Config.STATIC_INDEX_DIR
+) -> Tuple[int, int]:
+    """Load, split and embed static content and write the index artifact to output_dir"""
+    from .document_processor import DocumentProcessor
+    
+    processor = DocumentProcessor()
+    documents = processor._load_static_documents(static_path)
+    splits = processor.text_splitter.split_documents(documents)
+    if not splits:
+        raise Exception(f"No static content found in {static_path}")
+    
+    vectorstore = FAISS.from_documents(splits, processor.embeddings)
+    
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    # Remove the old manifest first so a half-written artifact never validates
+    if os.path.exists(manifest_path):
+        os.unlink(manifest_path)
+    
+    faiss.write_index(vectorstore.index, os.path.join(output_dir, INDEX_FILE))
+    
+    with open(os.path.join(output_dir, CHUNKS_FILE), 'w', encoding='utf-8') as f:
+        for position in range(vectorstore.index.ntotal):
+            doc = vectorstore.docstore.search(vectorstore.index_to_docstore_id[position])
+            f.write(json.dumps({"page_content": doc.page_content, "metadata": doc.metadata}) + "\n")
+    
+    manifest = build_manifest(static_path)
+    manifest["num_documents"] = len(documents)
+    manifest["num_chunks"] = len(splits)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    
+    return len(documents), len(splits)
+
+def load_static_index(
+    embeddings,
+    static_path: str = Config.STATIC_CONTENT_DIR,
+    index_dir: str = Config.STATIC_INDEX_DIR
+) -> Optional[Tuple[FAISS, int]]:
+    """Return (vectorstore, number of documents) from a prebuilt artifact, or None if missing or stale"""
+    manifest_path = os.path.join(index_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+    
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        
+        current = build_manifest(static_path)
+        if any(manifest.get(key) != value for key, value in current.items()):
+            print("Warning: Static index is out of date, rebuilding from static content")
+            return None
+        
+        index = _read_index(os.path.join(index_dir, INDEX_FILE))
+        
+        docs = {}
+        with open(os.path.join(index_dir, CHUNKS_FILE), 'r', encoding='utf-8') as f:
+            for position, line in enumerate(f):
+                record = json.loads(line)
+                docs[str(position)] = Document(page_content=record["page_content"], metadata=record["metadata"])
+        
+        if len(docs) != index.ntotal:
+            print("Warning: Static index chunk store does not match the index, rebuilding")
+            return None
+        
+        vectorstore = FAISS(
+            embedding_function=embeddings,
+            index=index,
+            docstore=InMemoryDocstore(docs),
+            index_to_docstore_id={position: str(position) for position in range(index.ntotal)}
+        )
+        return vectorstore, manifest.get("num_documents", 0)
+    except Exception as e:
+        print(f"Warning: Could not load static index: {e}")
+        return None
+
+def _read_index(path: str):
+    # Map the index file instead of reading it, so worker processes share the pages.
+    # IO_FLAG_MMAP_IFC maps flat indexes on newer faiss builds; older ones fall back to a plain read
+    flags = getattr(faiss, 'IO_FLAG_MMAP_IFC', faiss.IO_FLAG_MMAP)
+    try:
+        return faiss.read_index(path, flags)
+    except RuntimeError:
+        return faiss.read_index(path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the static content FAISS index")
+    parser.add_argument("--static-dir", default=Config.STATIC_CONTENT_DIR, help="Directory with static content files")
+    parser.add_argument("--output-dir", default=Config.STATIC_INDEX_DIR, help="Directory to write the index artifact to")
+    args = parser.parse_args(argv)
+    
+    num_documents, num_chunks = build_static_index(args.static_dir, args.output_dir)
+    print(f"✅ Indexed {num_documents} static documents ({num_chunks} chunks) into {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Content-addressed cache for values derived from uploaded files, bounded by memory
+"""
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, MutableMapping, Optional
+
+# Uploads whose digest is remembered per session; older entries are simply recomputed
+MAX_TRACKED_UPLOADS = 64
+
+def upload_digest(uploaded_file, state: Optional[MutableMapping] = None) -> str:
+    """sha256 of an upload's bytes, hashed once per upload rather than on every rerun
+    
+    Streamlit gives each upload a file_id that stays the same across reruns, so with a
+    session state the digest is looked up by file_id instead of hashing the bytes again.
+    """
+    file_id = getattr(uploaded_file, "file_id", None)
+    digests = None
+    if state is not None and file_id is not None:
+        digests = state.setdefault("upload_digests", OrderedDict())
+        digest = digests.get(file_id)
+        if digest is not None:
+            digests.move_to_end(file_id)
+            return digest
+    
+    digest = hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+    if digests is not None:
+        digests[file_id] = digest
+        while len(digests) > MAX_TRACKED_UPLOADS:
+            digests.popitem(last=False)
+    return digest
+
+def size_of(value: Any) -> int:
+    """Approximate memory held by a cached value: strings, bytes and lists/tuples of them"""
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(size_of(item) for item in value)
+    return sys.getsizeof(value)
+
+class UploadCache:
+    """LRU cache bounded by the total size of its values rather than by entry count
+    
+    Keys are content digests (optionally namespaced, e.g. "pdf:<digest>"), so the same
+    file uploaded by different sessions or on different pages shares one entry.
+    """
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def set(self, key: str, value: Any):
+        size = size_of(value)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[0]
+            # A value larger than the whole budget would only evict everything else
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (size, value)
+            self._bytes += size
+            self._evict(self.max_bytes)
+    
+    def trim(self, max_bytes: int) -> int:
+        """Evict least recently used entries until at most max_bytes remain; returns bytes freed"""
+        with self._lock:
+            before = self._bytes
+            self._evict(max_bytes)
+            return before - self._bytes
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+    
+    def _evict(self, max_bytes: int):
+        while self._entries and self._bytes > max_bytes:
+            _, (size, _) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
@@ -0,0 +1,26 @@
+from src.text_cleaning import PhraseMatcher, UNWANTED_PHRASES, _clean, clean_job_text
+
+def test_overlapping_phrases_leftmost_match_wins():
+    # "sign in" and "indeed.com" overlap; the earlier one is removed and the rest is kept
+    assert _clean("Sign indeed.com") == "deed.com"
+    assert _clean("Apply at indeed.com or sign in") == "Apply at or"
+
+def test_longest_phrase_wins_at_one_position():
+    matcher = PhraseMatcher(["menu", "menu bar"])
+    assert matcher.remove("Open the menu bar now") == "Open the  now"
+
+def test_result_does_not_depend_on_unrelated_characters():
+    # Characters whose lower-case form has a different length used to switch matchers
+    assert _clean("İstanbul clinic. Sign indeed.com") == "İstanbul clinic. deed.com"
+
+def test_case_insensitive_across_whitespace():
+    assert _clean("Nurse\nSIGN\t\tIN today") == "Nurse today"
+
+def test_truncated_output_matches_full_clean():
+    text = " ".join(["Patient care", "Sign indeed.com", "menus", "İ"] * 2000)
+    for max_length in (10, 50, 300, 3000):
+        assert clean_job_text(text, max_length) == _clean(text)[:max_length]
+
+def test_every_phrase_is_removed():
+    text = " | ".join(phrase.upper() for phrase in UNWANTED_PHRASES)
+    assert _clean(text).replace("|", "").strip() == ""